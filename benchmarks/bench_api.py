@@ -0,0 +1,172 @@
+"""
+Throughput and tail latency of the API service (src/api/service.py) against
+the inline path the Streamlit dashboard uses.
+
+The service is started with uvicorn in a subprocess and driven by concurrent
+HTTP clients. The inline path calls the same engines directly, one request
+after another on a single thread, as a dashboard script run does.
+
+Scenarios:
+    problem        one Calculus problem per request
+    problem_batch  BATCH_SIZE problems per request (reported per request and per problem)
+    check          checking an answer to a previously served problem
+    simulate       a RocketSimulator run with random parameters (mostly cache misses)
+
+Usage: python benchmarks/bench_api.py [--requests 200] [--concurrency 16] [--workers N] [--port 8765]
+"""
+import argparse
+import asyncio
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+
+import httpx
+
+from src.core.modules.math_foundations.checker import AnswerChecker
+from src.core.modules.math_foundations.generator import MathGenerator
+from src.core.modules.physics.simulation import RocketSimulator
+
+CATEGORY = "Calculus (Derivatives)"
+BATCH_SIZE = 20
+SUBMISSION = "2*x"
+
+
+def percentile(values, q):
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def random_rocket(rng):
+    return dict(dry_mass=rng.randrange(10, 500, 10), fuel_mass=rng.randrange(10, 200, 5),
+                thrust=rng.randrange(1000, 20000, 500), burn_time=rng.randrange(2, 60) / 2)
+
+
+# --- Inline (dashboard) path ---
+
+def run_inline(scenario, n):
+    generator = MathGenerator(seed=0)
+    checker = AnswerChecker()
+    rng = random.Random(0)
+    problems = [generator.get_problem(CATEGORY) for _ in range(n)]
+    actions = {
+        "problem": lambda i: generator.get_problem(CATEGORY),
+        "problem_batch": lambda i: [generator.get_problem(CATEGORY) for _ in range(BATCH_SIZE)],
+        "check": lambda i: checker.check(problems[i], SUBMISSION),
+        "simulate": lambda i: RocketSimulator(**random_rocket(rng)).run(),
+    }
+    action = actions[scenario]
+    latencies = []
+    start = time.perf_counter()
+    for i in range(n):
+        t = time.perf_counter()
+        action(i)
+        latencies.append(time.perf_counter() - t)
+    return time.perf_counter() - start, latencies, 0
+
+
+# --- Service path ---
+
+async def run_service(client, scenario, n, concurrency):
+    rng = random.Random(0)
+    problem_ids = []
+    if scenario == "check":
+        while len(problem_ids) < n:
+            response = await client.get("/problems", params={"category": CATEGORY, "count": min(100, n - len(problem_ids))})
+            problem_ids += [p["id"] for p in response.json()["problems"]]
+
+    def request(i):
+        if scenario == "problem":
+            return client.get("/problems", params={"category": CATEGORY})
+        if scenario == "problem_batch":
+            return client.get("/problems", params={"category": CATEGORY, "count": BATCH_SIZE})
+        if scenario == "check":
+            return client.post("/answers", json={"problem_id": problem_ids[i], "submission": SUBMISSION})
+        return client.post("/simulations", json=random_rocket(rng))
+
+    latencies = []
+    rejected = 0
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index, rejected
+        while next_index < n:
+            i = next_index
+            next_index += 1
+            t = time.perf_counter() # Latency as the client sees it, retries included
+            while True:
+                response = await request(i)
+                if response.status_code != 503:
+                    break
+                # Backpressure: back off as the server asks, then retry
+                rejected += 1
+                await asyncio.sleep(0.01)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - t)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - start, latencies, rejected
+
+
+def start_server(port, workers):
+    env = dict(os.environ)
+    if workers:
+        env["MATHAPP_API_WORKERS"] = str(workers)
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.api.service:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                return proc
+        except httpx.TransportError:
+            time.sleep(0.25)
+    proc.terminate()
+    raise RuntimeError("API service did not start")
+
+
+def report(label, scenario, elapsed, latencies, rejected):
+    rps = len(latencies) / elapsed
+    per_problem = f"  ({rps * BATCH_SIZE:.0f} problems/s)" if scenario == "problem_batch" else ""
+    print(f"{label:<9}{scenario:<15}{rps:>9.1f}{percentile(latencies, 50) * 1000:>10.1f}"
+          f"{percentile(latencies, 95) * 1000:>10.1f}{percentile(latencies, 99) * 1000:>10.1f}{rejected:>10}{per_problem}")
+
+
+async def main_async(args):
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", limits=limits, timeout=60) as client:
+        for scenario in args.scenarios.split(","):
+            report("service", scenario, *await run_service(client, scenario, args.requests, args.concurrency))
+            report("inline", scenario, *run_inline(scenario, args.requests))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the API service against the inline dashboard path.")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent HTTP clients")
+    parser.add_argument("--workers", type=int, default=None, help="Service worker processes (default: CPU count)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--scenarios", default="problem,problem_batch,check,simulate")
+    args = parser.parse_args()
+
+    proc = start_server(args.port, args.workers)
+    try:
+        print(f"{args.requests} requests per scenario, {args.concurrency} concurrent clients")
+        print(f"{'path':<9}{'scenario':<15}{'req/s':>9}{'p50 (ms)':>10}{'p95 (ms)':>10}{'p99 (ms)':>10}{'503s':>10}")
+        asyncio.run(main_async(args))
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+if __name__ == "__main__":
+    main()
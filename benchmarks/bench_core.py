@@ -0,0 +1,369 @@
+"""
+Microbenchmarks for the core engines, with regression checks against a stored baseline.
+
+Each benchmark times one piece in isolation and records its peak traced
+memory with tracemalloc. Fast operations are repeated within a round until the
+round lasts at least MIN_ROUND_SECONDS; the best round is used for comparison
+(it is the least affected by other load on the machine) and the median is reported too:
+    generator.*    MathGenerator problem generation (latency and problems/s);
+                   generator.linalg_* are the batched matrix families at 2x2..5x5
+    problem.*      Problem.from_dict, the compact record kept per pool slot and session
+    simulation.*   RocketSimulator.run across dt values and rocket sizes
+    lessons.*      LessonManager lesson/figure construction
+    scheduler.*    ReviewScheduler next/record with 200k logged attempts, and reload
+                   (snapshot plus the longest possible log tail)
+    storage.csv_*  CSVStorage load/save at 30, 10k and 100k rows
+    warehouse.*    ProgressWarehouse snapshot append, and cohort queries over 2000 learners
+
+Results are written as JSON (benchmarks/results/latest.json by default) and
+compared with benchmarks/baseline.json. A benchmark regresses when its time
+per operation (best round) exceeds the baseline by more than its tolerance, or its memory
+peak exceeds the baseline by more than MEMORY_TOLERANCE; any regression makes
+the script exit with status 1. Timings depend on the machine, so refresh the
+baseline with --update-baseline on the machine that runs the comparison.
+
+Usage: python benchmarks/bench_core.py [--filter PREFIX] [--update-baseline]
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pandas as pd
+
+from src.core.content import LessonManager
+from src.core.modules.math_foundations import linalg
+from src.core.modules.math_foundations.generator import MathGenerator
+from src.core.modules.math_foundations.problem import Problem
+from src.core.modules.physics.simulation import RocketSimulator
+from src.core.scheduler import SNAPSHOT_EVERY, ReviewScheduler
+from src.core.storage import COLUMNS, CSVStorage
+from src.core.warehouse import ProgressWarehouse
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(BENCH_DIR, "baseline.json")
+RESULTS_FILE = os.path.join(BENCH_DIR, "results", "latest.json")
+
+DEFAULT_TOLERANCE = 0.5 # Allowed slowdown relative to the baseline (0.5 = 50%)
+MEMORY_TOLERANCE = 0.25
+MEMORY_SLACK_BYTES = 64 * 1024 # Absolute allowance so small peaks do not flap
+ROUNDS = 7
+MIN_ROUND_SECONDS = 0.05
+
+ROCKETS = {
+    "light": dict(dry_mass=50.0, fuel_mass=20.0, thrust=2000.0, burn_time=5.0),
+    "default": dict(dry_mass=100.0, fuel_mass=50.0, thrust=5000.0, burn_time=10.0),
+    "heavy": dict(dry_mass=300.0, fuel_mass=150.0, thrust=12000.0, burn_time=20.0),
+}
+
+
+class Benchmark:
+    def __init__(self, name, setup, items=1, tolerance=DEFAULT_TOLERANCE, rounds=ROUNDS):
+        """
+        name: Result key, e.g. "simulation.euler_dt0.01_default"
+        setup: Callable returning the operation to time (setup cost is not timed)
+        items: Units of work per operation, used for throughput (e.g. problems generated)
+        tolerance: Allowed slowdown before the benchmark counts as a regression
+        """
+        self.name = name
+        self.setup = setup
+        self.items = items
+        self.tolerance = tolerance
+        self.rounds = rounds
+
+    def run(self):
+        op = self.setup()
+        start = time.perf_counter()
+        op() # Warm-up (imports, template caches), also sizes the rounds
+        loops = max(1, int(MIN_ROUND_SECONDS / max(time.perf_counter() - start, 1e-9)))
+
+        times = []
+        for _ in range(self.rounds):
+            start = time.perf_counter()
+            for _ in range(loops):
+                op()
+            times.append((time.perf_counter() - start) / loops)
+
+        gc.collect()
+        tracemalloc.start()
+        op()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        best = min(times)
+        return {
+            "seconds": best,
+            "median_seconds": statistics.median(times),
+            "per_item_us": best / self.items * 1e6,
+            "throughput": self.items / best if best else None,
+            "peak_bytes": peak,
+            "rounds": self.rounds,
+            "loops": loops,
+            "tolerance": self.tolerance,
+        }
+
+
+# --- Benchmark setups ---
+
+def generator_setup(method, count):
+    def setup():
+        gen = MathGenerator(seed=0)
+        generate = getattr(gen, method)
+        return lambda: [generate() for _ in range(count)]
+    return setup
+
+
+def linalg_setup(batch, size, count):
+    def setup():
+        return lambda: batch(count, size, seed=0)
+    return setup
+
+
+def problem_setup(category, count):
+    def setup():
+        gen = MathGenerator(seed=0)
+        problems = [gen.get_problem(category) for _ in range(count)]
+        return lambda: [Problem.from_dict(problem) for problem in problems]
+    return setup
+
+
+def simulation_setup(rocket, dt):
+    def setup():
+        return lambda: RocketSimulator(**ROCKETS[rocket], dt=dt).run()
+    return setup
+
+
+def lesson_setup(subject, topic):
+    def setup():
+        manager = LessonManager()
+        return lambda: manager.build_lesson(subject, topic)
+    return setup
+
+
+SCHEDULER_HISTORY = 200_000
+SCHEDULER_SKILLS = {"Calculus (Derivatives)": 1, "Linear Algebra (Dot Product)": 2, "Linear Algebra (Determinant)": 3}
+
+
+def scheduler_history(workdir):
+    """Directory with SCHEDULER_HISTORY attempts logged, built once per run."""
+    path = os.path.join(workdir, "scheduler")
+    if not os.path.exists(path):
+        scheduler = ReviewScheduler(path, SCHEDULER_SKILLS)
+        rng = random.Random(0)
+        now = time.time()
+        # SNAPSHOT_EVERY - 1 extra attempts leave the longest tail a reload has to replay
+        for _ in range(SCHEDULER_HISTORY + SNAPSHOT_EVERY - 1):
+            category, level = scheduler.next()
+            now += rng.uniform(1, 100)
+            scheduler.record(category, level, rng.random() < 0.8, rng.uniform(2, 200), now=now)
+        scheduler._log.close()
+    return path
+
+
+def scheduler_setup(action, workdir):
+    def setup():
+        path = scheduler_history(workdir)
+        if action == "reload":
+            return lambda: ReviewScheduler(path)._log.close()
+        scheduler = ReviewScheduler(path)
+        if action == "next":
+            return scheduler.next
+        rng = random.Random(1)
+
+        def record_next():
+            category, level = scheduler.next()
+            scheduler.record(category, level, rng.random() < 0.8, 10.0)
+        return record_next
+    return setup
+
+
+def schedule_frame(rows):
+    rng = random.Random(rows)
+    return pd.DataFrame({
+        "Week": [i // 8 + 1 for i in range(rows)],
+        "Track": [rng.choice(["Math", "Coding", "ML"]) for _ in range(rows)],
+        "Module": [f"Module {i % 40}" for i in range(rows)],
+        "Topic": [f"Topic {i}" for i in range(rows)],
+        "Planned Hours": [rng.randint(1, 8) for _ in range(rows)],
+        "Status": [rng.choice(["Not Started", "In Progress", "Done"]) for _ in range(rows)],
+        "Output Lab": [f"https://example.com/lab/{i}" if i % 3 else "" for i in range(rows)],
+    }, columns=COLUMNS)
+
+
+def csv_setup(rows, action, workdir):
+    def setup():
+        storage = CSVStorage(os.path.join(workdir, f"schedule_{rows}.csv"))
+        df = schedule_frame(rows)
+        storage.save(df)
+        if action == "load":
+            return storage.load
+        return lambda: storage.save(df)
+    return setup
+
+
+WAREHOUSE_LEARNERS = 2000
+WAREHOUSE_SNAPSHOTS = 3 # Per learner, a week apart
+
+
+def warehouse_cohort(workdir):
+    """Warehouse with WAREHOUSE_SNAPSHOTS snapshots of each of WAREHOUSE_LEARNERS learners, built once per run."""
+    warehouse = ProgressWarehouse(os.path.join(workdir, "warehouse"))
+    if not warehouse.learners():
+        rng = random.Random(0)
+        df = schedule_frame(128)
+        start = datetime(2026, 1, 5, tzinfo=timezone.utc)
+        for learner in range(WAREHOUSE_LEARNERS):
+            for week in range(WAREHOUSE_SNAPSHOTS):
+                when = start + timedelta(weeks=week, hours=rng.randrange(24 * 7))
+                warehouse.append(f"learner{learner:05d}", df, when=when)
+    return warehouse
+
+
+def warehouse_setup(action, workdir):
+    def setup():
+        if action == "append":
+            warehouse = ProgressWarehouse(os.path.join(workdir, "warehouse_append"))
+            df = schedule_frame(128)
+            return lambda: warehouse.append("learner", df)
+        warehouse = warehouse_cohort(workdir)
+        return getattr(warehouse, action)
+    return setup
+
+
+def build_benchmarks(workdir):
+    benchmarks = [
+        Benchmark("generator.calculus_derivative", generator_setup("generate_calculus_derivative", 200), items=200),
+        Benchmark("generator.linear_algebra_dot", generator_setup("generate_linear_algebra_dot", 1000), items=1000),
+    ]
+    families = {
+        "matmul": linalg.matrix_product_problems,
+        "det": linalg.determinant_problems,
+        "inverse": linalg.inverse_problems,
+        "eigen": linalg.eigenvalue_problems,
+    }
+    for family, batch in families.items():
+        for size in linalg.SIZES:
+            benchmarks.append(Benchmark(f"generator.linalg_{family}_{size}x{size}", linalg_setup(batch, size, 1000),
+                                        items=1000))
+    benchmarks += [
+        Benchmark("problem.compact_derivative", problem_setup("Calculus (Derivatives)", 200), items=200),
+        Benchmark("problem.compact_matmul", problem_setup("Linear Algebra (Matrix Product)", 200), items=200),
+    ]
+    for dt in (0.1, 0.01, 0.001):
+        for rocket in ROCKETS:
+            benchmarks.append(Benchmark(f"simulation.euler_dt{dt:g}_{rocket}", simulation_setup(rocket, dt)))
+    benchmarks += [
+        Benchmark("lessons.derivative_intuition", lesson_setup("Calculus", "Derivatives Intuition")),
+        Benchmark("lessons.vector_operations", lesson_setup("Linear Algebra", "Vector Operations")),
+    ]
+    for action in ("next", "record_next", "reload"):
+        benchmarks.append(Benchmark(f"scheduler.{action}_200k", scheduler_setup(action, workdir)))
+    for rows in (30, 10_000, 100_000):
+        for action in ("load", "save"):
+            # Small files finish in well under a millisecond, where scheduling noise dominates
+            benchmarks.append(Benchmark(f"storage.csv_{action}_{rows}", csv_setup(rows, action, workdir), items=rows,
+                                        tolerance=1.0 if rows < 1000 else DEFAULT_TOLERANCE))
+    benchmarks += [
+        Benchmark("warehouse.append", warehouse_setup("append", workdir)),
+        Benchmark(f"warehouse.completion_{WAREHOUSE_LEARNERS}", warehouse_setup("completion", workdir),
+                  items=WAREHOUSE_LEARNERS),
+        Benchmark(f"warehouse.burndown_{WAREHOUSE_LEARNERS}", warehouse_setup("burndown", workdir),
+                  items=WAREHOUSE_LEARNERS * WAREHOUSE_SNAPSHOTS),
+    ]
+    return benchmarks
+
+
+# --- Baseline comparison ---
+
+def compare(results, baseline):
+    """Returns a list of (name, reason) for every benchmark slower or larger than the baseline allows."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        limit = base["seconds"] * (1 + result["tolerance"])
+        if result["seconds"] > limit:
+            regressions.append((name, f"{result['seconds'] * 1000:.3f} ms vs baseline "
+                                      f"{base['seconds'] * 1000:.3f} ms (+{result['tolerance']:.0%} allowed)"))
+        memory_limit = base["peak_bytes"] * (1 + MEMORY_TOLERANCE) + MEMORY_SLACK_BYTES
+        if result["peak_bytes"] > memory_limit:
+            regressions.append((name, f"peak {result['peak_bytes'] / 1024:.0f} KiB vs baseline "
+                                      f"{base['peak_bytes'] / 1024:.0f} KiB (+{MEMORY_TOLERANCE:.0%} allowed)"))
+    return regressions
+
+
+def write_json(path, payload):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the core microbenchmarks and compare with the baseline.")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name starts with this prefix")
+    parser.add_argument("--output", default=RESULTS_FILE, help="Where to write the results JSON")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the new baseline")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        benchmarks = [b for b in build_benchmarks(workdir) if b.name.startswith(args.filter)]
+        print(f"{'benchmark':<36}{'time/op (ms)':>14}{'per item (us)':>15}{'items/s':>12}{'peak (KiB)':>12}")
+        for bench in benchmarks:
+            result = bench.run()
+            results[bench.name] = result
+            print(f"{bench.name:<36}{result['seconds'] * 1000:>14.3f}{result['per_item_us']:>15.2f}"
+                  f"{result['throughput']:>12.0f}{result['peak_bytes'] / 1024:>12.0f}")
+
+    write_json(args.output, {
+        "time": time.time(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    })
+    print(f"\nResults written to {args.output}")
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)["results"]
+        baseline.update(results)
+        write_json(args.baseline, {"python": platform.python_version(), "machine": platform.machine(),
+                                   "results": baseline})
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline found; run with --update-baseline to create one.")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+
+    regressions = compare(results, baseline)
+    missing = sorted(set(results) - set(baseline))
+    if missing:
+        print(f"Not in baseline (not checked): {', '.join(missing)}")
+    if regressions:
+        print(f"\nREGRESSIONS ({len(regressions)}):")
+        for name, reason in regressions:
+            print(f"  FAIL {name}: {reason}")
+        return 1
+    print(f"All {len(results) - len(missing)} benchmarks within tolerance of the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
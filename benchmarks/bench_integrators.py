@@ -0,0 +1,80 @@
+"""
+Compares the Euler, RK4 and adaptive RK45 integrators of RocketSimulator.
+
+For each configuration the error is measured against a tight-tolerance RK45
+reference (apogee altitude in m, flight time in s). The summary then picks,
+for each error target, the cheapest setting of every method that meets it and
+reports its step count and wall time.
+
+Usage: python benchmarks/bench_integrators.py
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.core.modules.physics.simulation import RocketSimulator
+
+ROCKETS = {
+    "default": dict(dry_mass=100.0, fuel_mass=50.0, thrust=5000.0, burn_time=10.0),
+    "heavy": dict(dry_mass=300.0, fuel_mass=150.0, thrust=12000.0, burn_time=20.0),
+}
+
+SETTINGS = (
+    [("euler", dict(dt=dt)) for dt in (0.1, 0.03, 0.01, 0.003, 0.001, 0.0003, 0.0001)]
+    + [("rk4", dict(dt=dt)) for dt in (1.0, 0.5, 0.2, 0.1, 0.05)]
+    + [("rk45", dict(rtol=tol, atol=tol)) for tol in (1e-3, 1e-4, 1e-6, 1e-8)]
+)
+
+TARGETS = (1.0, 0.1, 0.01) # Apogee error targets (m)
+
+
+def timed_run(repeat=3, **params):
+    """Best-of-N wall time (s) and the result of the last run."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = RocketSimulator(**params).run()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def setting_label(method, options):
+    return f"{method} " + ", ".join(f"{k}={v:g}" for k, v in options.items())
+
+
+def main():
+    for name, rocket in ROCKETS.items():
+        reference = RocketSimulator(**rocket, method="rk45", rtol=1e-12, atol=1e-12).run()
+        ref_apogee = reference["Altitude (m)"].max()
+        ref_flight = reference["Time (s)"][-1]
+
+        print(f"\n=== {name}: {rocket}")
+        print(f"Reference apogee {ref_apogee:.6f} m, flight time {ref_flight:.6f} s")
+        print(f"{'setting':<32}{'steps':>10}{'time (ms)':>12}{'apogee err (m)':>16}{'flight err (s)':>16}")
+
+        rows = []
+        for method, options in SETTINGS:
+            repeat = 1 if method == "euler" and options["dt"] < 0.001 else 3
+            wall, result = timed_run(repeat=repeat, method=method, **rocket, **options)
+            apogee_err = abs(result["Altitude (m)"].max() - ref_apogee)
+            flight_err = abs(result["Time (s)"][-1] - ref_flight)
+            rows.append((method, options, result.steps, wall, apogee_err))
+            print(f"{setting_label(method, options):<32}{result.steps:>10}{wall * 1000:>12.2f}"
+                  f"{apogee_err:>16.2e}{flight_err:>16.2e}")
+
+        print("\nCheapest setting per method at matched apogee error:")
+        for target in TARGETS:
+            print(f"  error <= {target:g} m")
+            for method in ("euler", "rk4", "rk45"):
+                candidates = [r for r in rows if r[0] == method and r[4] <= target]
+                if not candidates:
+                    print(f"    {method:<6} not reached")
+                    continue
+                best = min(candidates, key=lambda r: r[3])
+                print(f"    {setting_label(best[0], best[1]):<30} {best[2]:>8} steps {best[3] * 1000:>10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+Concurrent-session load harness for the Streamlit dashboard.
+
+Runs N headless sessions of src/app/dashboard.py side by side (Streamlit's
+AppTest, one thread per session) in a single process, as the Streamlit server
+would, so st.cache_resource engines are shared and st.session_state is per
+session. AppTest installs a process-global runtime for the duration of each
+script run, so runs from different sessions are serialized: sessions queue for
+the app the way requests queue for a busy single-process server, and the
+report separates that wait from the script run itself.
+
+Each session follows a scripted sequence of interactions:
+    open the Simulation Lab, move the thrust slider, LAUNCH,
+    open the Practice Arena, click New Problem, click Save Changes
+repeated for the given number of iterations (slider values vary per session,
+so simulations are a mix of cache hits and misses).
+
+Reported per session count:
+    response time percentiles (p50/p95/p99, ms, including the queue wait)
+    and median run time for every interaction type
+    throughput (interactions per second across all sessions)
+    resident memory growth per live session
+
+The app runs against a scratch copy of data/dashboard.csv (MATHAPP_DATA_DIR),
+so Save Changes never touches the real schedule.
+
+Usage: python benchmarks/load_sessions.py [--sessions 1,5,10] [--iterations 3] [--json out.json]
+"""
+import argparse
+import gc
+import json
+import logging
+import math
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+APP_FILE = os.path.join(ROOT, "src", "app", "dashboard.py")
+SOURCE_CSV = os.path.join(ROOT, "data", "dashboard.csv")
+
+INTERACTION_TIMEOUT = 120 # Seconds before AppTest gives up on a single script run
+
+# Held for each script run (AppTest swaps streamlit.runtime.Runtime._instance in and out)
+_run_lock = threading.Lock()
+
+
+def rss_bytes():
+    """Current resident set size (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def percentile(values, q):
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def _button(at, label):
+    return next(b for b in at.button if label in b.label)
+
+
+def _slider(at, label):
+    return next(s for s in at.slider if s.label == label)
+
+
+# Interaction name -> action on a session; each action ends with a script run
+INTERACTIONS = [
+    ("open_simulation", lambda at, rng: at.radio(key="section").set_value("🚀 Simulation Lab").run()),
+    ("move_slider", lambda at, rng: _slider(at, "Engine Thrust (N)").set_value(rng.randrange(1000, 20001, 500)).run()),
+    ("launch", lambda at, rng: _button(at, "LAUNCH").click().run()),
+    ("open_practice", lambda at, rng: at.radio(key="section").set_value("🏋️ Practice Arena").run()),
+    ("new_problem", lambda at, rng: _button(at, "New Problem").click().run()),
+    ("save_changes", lambda at, rng: _button(at, "Save Changes").click().run()),
+]
+
+
+class Session:
+    def __init__(self, index, iterations, seed=0):
+        self.index = index
+        self.iterations = iterations
+        self.rng = random.Random(f"{seed}:{index}")
+        self.latencies = {} # name -> response times (queue wait + run)
+        self.run_times = {}
+        self.errors = []
+        self.at = None # Kept after the run so its session state stays alive for the memory reading
+
+    def _timed(self, name, action):
+        start = time.perf_counter()
+        with _run_lock:
+            run_start = time.perf_counter()
+            try:
+                self.at = action()
+            except Exception as e:
+                self.errors.append(f"{name}: {e}")
+                return False
+        end = time.perf_counter()
+        self.latencies.setdefault(name, []).append(end - start)
+        self.run_times.setdefault(name, []).append(end - run_start)
+        self.errors.extend(f"{name}: {exc.value}" for exc in self.at.exception)
+        return True
+
+    def run(self, start_barrier):
+        from streamlit.testing.v1 import AppTest
+
+        start_barrier.wait()
+        if not self._timed("first_load", lambda: AppTest.from_file(APP_FILE, default_timeout=INTERACTION_TIMEOUT).run()):
+            return self
+        for _ in range(self.iterations):
+            for name, action in INTERACTIONS:
+                if not self._timed(name, lambda: action(self.at, self.rng)):
+                    return self
+        return self
+
+
+def run_level(sessions, iterations):
+    """Runs `sessions` concurrent sessions. Returns a report dict."""
+    gc.collect()
+    rss_before = rss_bytes()
+    barrier = threading.Barrier(sessions)
+    workers = [Session(i, iterations) for i in range(sessions)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        list(pool.map(lambda s: s.run(barrier), workers))
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    rss_after = rss_bytes() # Sessions (and their session_state) are still referenced here
+
+    latencies, run_times = {}, {}
+    for session in workers:
+        for name, values in session.latencies.items():
+            latencies.setdefault(name, []).extend(values)
+        for name, values in session.run_times.items():
+            run_times.setdefault(name, []).extend(values)
+    interactions = sum(len(values) for values in latencies.values())
+    return {
+        "sessions": sessions,
+        "iterations": iterations,
+        "elapsed_s": elapsed,
+        "interactions": interactions,
+        "throughput_per_s": interactions / elapsed if elapsed else None,
+        "rss_before_mb": rss_before / 2**20,
+        "rss_after_mb": rss_after / 2**20,
+        "rss_per_session_mb": (rss_after - rss_before) / 2**20 / sessions,
+        "latency_ms": {
+            name: {
+                "count": len(values),
+                "p50": percentile(values, 50) * 1000,
+                "p95": percentile(values, 95) * 1000,
+                "p99": percentile(values, 99) * 1000,
+                "max": max(values) * 1000,
+                "run_p50": percentile(run_times[name], 50) * 1000,
+            }
+            for name, values in latencies.items()
+        },
+        "errors": [error for session in workers for error in session.errors],
+    }
+
+
+def print_report(report):
+    print(f"\n=== {report['sessions']} sessions x {report['iterations']} iterations: "
+          f"{report['interactions']} interactions in {report['elapsed_s']:.1f} s "
+          f"({report['throughput_per_s']:.1f}/s)")
+    print(f"RSS {report['rss_before_mb']:.0f} -> {report['rss_after_mb']:.0f} MiB "
+          f"({report['rss_per_session_mb']:+.2f} MiB per session)")
+    print(f"{'interaction':<18}{'count':>7}{'p50 (ms)':>11}{'p95 (ms)':>11}{'p99 (ms)':>11}{'max (ms)':>11}"
+          f"{'run p50 (ms)':>14}")
+    for name, s in report["latency_ms"].items():
+        print(f"{name:<18}{s['count']:>7}{s['p50']:>11.1f}{s['p95']:>11.1f}{s['p99']:>11.1f}{s['max']:>11.1f}"
+              f"{s['run_p50']:>14.1f}")
+    if report["errors"]:
+        print(f"{len(report['errors'])} errors, first: {report['errors'][0]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate concurrent dashboard sessions and report latency and memory.")
+    parser.add_argument("--sessions", default="1,5,10", help="Comma-separated concurrent session counts to test")
+    parser.add_argument("--iterations", type=int, default=3, help="Times each session repeats the interaction script")
+    parser.add_argument("--json", help="Also write the reports to this JSON file")
+    args = parser.parse_args()
+    levels = [int(n) for n in args.sessions.split(",")]
+
+    # Streamlit's per-run warnings and the app's per-save log lines would drown the report
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        if os.path.exists(SOURCE_CSV):
+            shutil.copy(SOURCE_CSV, os.path.join(data_dir, "dashboard.csv"))
+        os.environ["MATHAPP_DATA_DIR"] = data_dir
+
+        # One untimed session first, so imports and shared engines are not billed to the first level
+        run_level(1, 1)
+
+        reports = []
+        for sessions in levels:
+            report = run_level(sessions, args.iterations)
+            print_report(report)
+            reports.append(report)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=2)
+        print(f"\nReports written to {args.json}")
+    return 1 if any(report["errors"] for report in reports) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
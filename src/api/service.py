@@ -0,0 +1,274 @@
+"""
+HTTP API over the core engines, for clients other than the Streamlit dashboard.
+
+    GET  /categories                      problem categories (from the plugin registry)
+    GET  /problems?category=...&count=N   N new problems in one call (N <= MAX_BATCH)
+    POST /answers                         check a submission against a served problem
+    POST /simulations                     run RocketSimulator, summary and optional telemetry
+    GET  /stats                           pool load, rejections and cache statistics
+
+Problem generation (sympy), answer checking and simulations run on a bounded
+process pool, so the event loop only parses requests and awaits results. At
+most `max_in_flight` jobs are admitted to the pool at once; beyond that
+requests are refused with 503 and a Retry-After header rather than queued
+without bound. A job that runs past JOB_TIMEOUT gets 504 and the pool is
+replaced, so a stuck worker cannot hold its slot. Answers stay on the
+server: /problems returns questions only, and clients submit answers by
+problem id. Submissions are screened in the event loop (length, the
+checker's token allowlist and power limits; no builtins or attribute access)
+before they reach a worker, and a submission the checker rejects or fails
+on gets an "invalid" verdict rather than an error.
+
+Run: uvicorn src.api.service:app --port 8000
+Worker processes default to the CPU count (MATHAPP_API_WORKERS overrides).
+"""
+import asyncio
+import multiprocessing
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException, Query
+from pydantic import BaseModel, Field
+
+from src.core.logger import Logger
+from src.core.modules.math_foundations.checker import AnswerChecker
+from src.core.plugins import get_registry
+from src.utils.cache import LRUCache
+
+logger = Logger().get_logger()
+
+MAX_BATCH = 100 # Problems per /problems call
+JOBS_PER_WORKER = 4 # Admitted pool jobs per worker process before requests get 503
+JOB_TIMEOUT = 30.0 # Seconds a pool job may run before it is abandoned and the pool replaced
+ANSWER_CACHE_ENTRIES = 100_000 # Served problems whose answers can still be checked
+SIMULATION_CACHE_ENTRIES = 1024
+TELEMETRY_MAX_POINTS = 2000 # Larger flights are downsampled (LTTB)
+
+METHODS = ("euler", "rk4", "rk45") # Mirrors physics.simulation.METHODS without importing it here
+
+
+# --- Pool workers (run in the worker processes) ---
+
+_generator = None
+_checker = None
+
+
+def _worker_init():
+    global _generator, _checker
+    from src.core.modules.math_foundations.checker import AnswerChecker
+    from src.core.modules.math_foundations.generator import MathGenerator
+    _generator = MathGenerator()
+    _checker = AnswerChecker()
+
+
+def _warm_up():
+    """Imports the engines and fills the template caches so the first real request is not slow."""
+    for category in _generator.categories():
+        _generator.get_problem(category)
+    return os.getpid()
+
+
+def _generate(category, count, seed):
+    from src.core.modules.math_foundations.bulk import serialize_problem
+    from src.core.modules.math_foundations.generator import MathGenerator
+    generator = _generator if seed is None else MathGenerator(seed=seed)
+    return [serialize_problem(generator.get_problem(category)) for _ in range(count)]
+
+
+def _check(raw_answer, submission):
+    try:
+        return _checker.check({"raw_answer": raw_answer}, submission)
+    except Exception as e:
+        logger.warning(f"Answer check failed: {type(e).__name__}: {e}")
+        return {"correct": False, "method": "invalid", "message": "Could not check this answer."}
+
+
+def _simulate(params, telemetry):
+    from src.core.modules.physics.downsample import downsample
+    from src.core.modules.physics.simulation import RocketSimulator
+    result = RocketSimulator(**params).run()
+    summary = {
+        "apogee": float(result["Altitude (m)"].max()),
+        "top_speed": float(result["Velocity (m/s)"].max()),
+        "flight_time": float(result["Time (s)"][-1]),
+        "steps": int(result.steps),
+        "events": {name: float(t) for name, t in result.events.items()},
+    }
+    if telemetry:
+        plotted = downsample(result, TELEMETRY_MAX_POINTS)
+        summary["telemetry"] = {col: plotted[col].tolist() for col in plotted.keys()}
+    return summary
+
+
+# --- Admission control ---
+
+class PoolGate:
+    """
+    Runs jobs on the process pool, refusing new ones once `limit` are in flight.
+    A job still running after `timeout` seconds fails with 504, and the pool is
+    replaced by a fresh one from `factory` (its workers are terminated, so jobs
+    sharing the old pool fail with 503 and can be retried).
+    """
+
+    def __init__(self, factory, limit, timeout=JOB_TIMEOUT):
+        """
+        factory: Callable returning a new executor
+        limit: Jobs admitted at once
+        timeout: Seconds a job may run
+        """
+        self.factory = factory
+        self.executor = factory()
+        self.limit = limit
+        self.timeout = timeout
+        self.in_flight = 0 # Only touched from the event loop thread
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.replaced = 0
+
+    async def run(self, fn, *args):
+        if self.in_flight >= self.limit:
+            self.rejected += 1
+            raise HTTPException(503, "Server busy, retry shortly.", headers={"Retry-After": "1"})
+        self.in_flight += 1
+        executor = self.executor
+        try:
+            future = asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+            return await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            logger.warning(f"Pool job {fn.__name__} ran past {self.timeout}s; replacing the pool.")
+            self.replace(executor)
+            raise HTTPException(504, "The request took too long to process.")
+        except BrokenProcessPool:
+            raise HTTPException(503, "Server busy, retry shortly.", headers={"Retry-After": "1"})
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+
+    def replace(self, executor):
+        """Swaps in a fresh pool for `executor` (once, if several jobs on it time out) and kills its workers."""
+        if executor is not self.executor:
+            return
+        self.executor = self.factory()
+        self.replaced += 1
+        # A worker stuck in a job never returns to shutdown(); terminate them all
+        processes = list((executor._processes or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+
+    def shutdown(self):
+        self.executor.shutdown(cancel_futures=True)
+
+    def stats(self):
+        return {"in_flight": self.in_flight, "limit": self.limit, "completed": self.completed,
+                "rejected": self.rejected, "timed_out": self.timed_out, "replaced": self.replaced}
+
+
+# --- Request bodies ---
+
+class AnswerSubmission(BaseModel):
+    problem_id: str
+    submission: str = Field(max_length=500)
+
+
+class SimulationRequest(BaseModel):
+    dry_mass: float = Field(gt=0, le=10_000)
+    fuel_mass: float = Field(ge=0, le=10_000)
+    thrust: float = Field(ge=0, le=1_000_000)
+    burn_time: float = Field(ge=0, le=300)
+    dt: float = Field(0.1, ge=0.001, le=1.0)
+    method: str = "euler"
+    record_every: int = Field(1, ge=1, le=1000)
+    telemetry: bool = False
+
+
+def create_app(workers=None, max_in_flight=None):
+    """
+    workers: Worker processes (default MATHAPP_API_WORKERS or the CPU count)
+    max_in_flight: Pool jobs admitted at once (default JOBS_PER_WORKER per worker)
+    """
+    workers = workers or int(os.environ.get("MATHAPP_API_WORKERS", "0")) or os.cpu_count() or 1
+    max_in_flight = max_in_flight or workers * JOBS_PER_WORKER
+
+    def new_executor():
+        # spawn: forking a process that already runs the event loop's threads is not safe
+        return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                   initializer=_worker_init)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        gate = PoolGate(new_executor, max_in_flight)
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(gate.executor, _warm_up) for _ in range(workers)))
+        app.state.gate = gate
+        app.state.answers = LRUCache(max_entries=ANSWER_CACHE_ENTRIES)
+        app.state.simulations = LRUCache(max_entries=SIMULATION_CACHE_ENTRIES)
+        logger.info(f"API ready: {workers} workers, {max_in_flight} jobs in flight max.")
+        try:
+            yield
+        finally:
+            gate.shutdown()
+
+    app = FastAPI(title="Math Foundations API", lifespan=lifespan)
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    @app.get("/categories")
+    async def categories():
+        return {"categories": list(get_registry().categories())}
+
+    @app.get("/problems")
+    async def problems(category: str, count: int = Query(1, ge=1, le=MAX_BATCH), seed: str = None):
+        if category not in get_registry().categories():
+            raise HTTPException(404, f"Unknown category: {category}")
+        # The whole batch is one pool job, so its overhead is paid once per call
+        batch = await app.state.gate.run(_generate, category, count, seed)
+        for problem in batch:
+            problem["id"] = uuid.uuid4().hex
+            problem.pop("answer", None)
+            app.state.answers.put(problem["id"], problem.pop("raw_answer", None))
+        return {"problems": batch}
+
+    @app.post("/answers")
+    async def answers(body: AnswerSubmission):
+        raw_answer = app.state.answers.get(body.problem_id)
+        if raw_answer is None:
+            raise HTTPException(404, "Unknown or expired problem id.")
+        if not isinstance(raw_answer, (list, tuple)): # List answers are read as plain numbers, not parsed
+            try:
+                AnswerChecker.screen(body.submission)
+            except ValueError as e:
+                return {"correct": False, "method": "invalid", "message": str(e)}
+        return await app.state.gate.run(_check, raw_answer, body.submission)
+
+    @app.post("/simulations")
+    async def simulations(body: SimulationRequest):
+        if body.method not in METHODS:
+            raise HTTPException(422, f"Unknown integration method: {body.method}. Choose from {METHODS}")
+        params = body.model_dump(exclude={"telemetry"})
+        key = (tuple(sorted(params.items())), body.telemetry)
+        summary = app.state.simulations.get(key)
+        if summary is None:
+            summary = await app.state.gate.run(_simulate, params, body.telemetry)
+            app.state.simulations.put(key, summary)
+        return summary
+
+    @app.get("/stats")
+    async def stats():
+        return {
+            "pool": app.state.gate.stats(),
+            "answers": app.state.answers.stats(),
+            "simulations": app.state.simulations.stats(),
+        }
+
+    return app
+
+
+app = create_app()
@@ -1,75 +1,170 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 import os
+import random
+import re
 import sys
+import time
+
+RUN_START = time.perf_counter()
 
 # Add project root to path so we can import from src
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
 from src.core.logger import Logger
+from src.utils import metrics
+from src.utils.startup import LazyModule, PROCESS_START, import_report, timed_import
+
+# Heavy dependencies load on first use, and only in the section that needs them
+pd = LazyModule("pandas")
+px = LazyModule("plotly.express")
 
-# Initialize Logger
-logger = Logger().get_logger()
+# Initialize Logger (first call configures it): writes happen on a background
+# thread so request paths only enqueue, and the log file rotates instead of growing forever
+logger = Logger(use_queue=True, rotation="size").get_logger()
 
 # Page Config
 st.set_page_config(page_title="Math Foundations Tracker", layout="wide")
 
 # File Path (Relative to src/app/dashboard.py -> ../../data/dashboard.csv)
-DATA_DIR = os.path.join(os.path.dirname(__file__), "../../data")
+# MATHAPP_DATA_DIR points the app at another data directory (e.g. a scratch copy for load tests)
+DATA_DIR = os.environ.get("MATHAPP_DATA_DIR") or os.path.join(os.path.dirname(__file__), "../../data")
 CSV_FILE = os.path.join(DATA_DIR, "dashboard.csv")
 NOTES_DIR = os.path.join(DATA_DIR, "notes")
+WAREHOUSE_DIR = os.path.join(DATA_DIR, "warehouse")
+# Learner whose schedule snapshots this app records in the progress warehouse
+LEARNER_ID = os.environ.get("MATHAPP_LEARNER", "me")
+
+# Simulation result cache limits (shared by all sessions)
+SIM_CACHE_ENTRIES = 256
+SIM_CACHE_BYTES = 64 * 1024 * 1024
+
+# Most telemetry samples sent to the chart; longer flights are downsampled (LTTB)
+SIM_CHART_POINTS = int(os.environ.get("MATHAPP_CHART_POINTS", "1000"))
+
+@st.cache_resource
+def get_simulation_cache():
+    from src.utils.cache import LRUCache
+    return LRUCache(max_entries=SIM_CACHE_ENTRIES, max_bytes=SIM_CACHE_BYTES, sizeof=lambda result: result.nbytes)
+
+@st.cache_resource
+def get_problem_pool():
+    from src.core.modules.math_foundations.pool import ProblemPool
+    return ProblemPool()
+
+@st.cache_resource
+def get_answer_checker():
+    from src.core.modules.math_foundations.checker import AnswerChecker
+    return AnswerChecker()
+
+@st.cache_resource
+def get_lesson_manager():
+    LessonManager = timed_import("src.core.content").LessonManager
+    return LessonManager()
+
+# Practice topic that lets the spaced-repetition scheduler pick the category and difficulty
+ADAPTIVE_TOPIC = "🧠 Adaptive review"
+
+# Review histories are per learner: ?learner=<id> in the URL picks one, else LEARNER_ID
+LEARNER_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9_.-]{0,63}")
 
+def session_learner():
+    learner = st.query_params.get("learner", LEARNER_ID)
+    return learner if LEARNER_PATTERN.fullmatch(learner) else LEARNER_ID
+
+@st.cache_resource(max_entries=256)
+def get_scheduler(learner):
+    """Review scheduler of one learner, shared by that learner's sessions (data in practice/<learner>/)."""
+    from src.core.plugins import get_registry
+    from src.core.scheduler import ReviewScheduler
+    registry = get_registry()
+    return ReviewScheduler(os.path.join(DATA_DIR, "practice", learner),
+                           skills={category: registry.levels(category) for category in registry.categories()})
+
+# Schedule storage backend: "sqlite" (default, imports dashboard.csv once) or "csv"
+STORAGE_BACKEND = os.environ.get("MATHAPP_STORAGE", "sqlite")
+
+@st.cache_resource
+def get_storage():
+    from src.core.storage import get_storage as make_storage
+    return make_storage(STORAGE_BACKEND, DATA_DIR)
+
+# Hot-path timings are summarized in the Performance section and written to
+# METRICS_FILE every METRICS_DUMP_INTERVAL seconds (MATHAPP_METRICS=0 disables them)
+METRICS_FILE = os.path.join(os.path.dirname(__file__), "../../logs/metrics.json")
+METRICS_DUMP_INTERVAL = float(os.environ.get("MATHAPP_METRICS_DUMP_INTERVAL", "60"))
+
+@st.cache_resource
+def get_warehouse():
+    ProgressWarehouse = timed_import("src.core.warehouse").ProgressWarehouse
+    return ProgressWarehouse(WAREHOUSE_DIR)
+
+@st.cache_resource
+def get_metrics_dump():
+    return metrics.PeriodicDump(METRICS_FILE, METRICS_DUMP_INTERVAL)
+
+get_metrics_dump()
+
+@st.cache_resource
+def get_schedule():
+    # A failed load raises and is not cached, so the next run retries instead of sharing an empty schedule
+    SharedSchedule = timed_import("src.core.progress").SharedSchedule
+    return SharedSchedule(get_storage().load())
+
+@metrics.timed("dashboard.load_data")
 def load_data():
+    """(df, aggregates) of the schedule shared by all sessions."""
     try:
-        if not os.path.exists(CSV_FILE):
-            logger.warning("Dashboard CSV not found, creating new one.")
-            return pd.DataFrame(columns=["Week", "Track", "Module", "Topic", "Planned Hours", "Status", "Output Lab"])
-        df = pd.read_csv(CSV_FILE)
-        # Ensure Link column is string to avoid Streamlit errors
-        df["Output Lab"] = df["Output Lab"].fillna("")
-        return df
+        return get_schedule().current()
     except Exception as e:
         logger.error(f"Failed to load data: {e}")
+        metrics.increment("dashboard.load_failures")
         st.error("Failed to load data. Check logs.")
-        return pd.DataFrame()
+        ProgressAggregates = timed_import("src.core.progress").ProgressAggregates
+        return pd.DataFrame(), ProgressAggregates()
 
+@metrics.timed("dashboard.save_data")
 def save_data(df):
+    """Saves the schedule; raises if storage fails, so the shared schedule keeps its saved state."""
     try:
-        if not os.path.exists(DATA_DIR):
-            os.makedirs(DATA_DIR)
-        df.to_csv(CSV_FILE, index=False)
+        df = get_storage().save(df)
         logger.info("Dashboard data saved successfully.")
     except Exception as e:
         logger.error(f"Failed to save data: {e}")
-        st.error("Failed to save data. Check logs.")
+        metrics.increment("dashboard.save_failures")
+        raise
+    try:
+        # Every save is also a snapshot for the cohort views; the schedule itself is already safe
+        get_warehouse().append(session_learner(), df)
+    except Exception as e:
+        logger.error(f"Failed to record progress snapshot: {e}")
+        metrics.increment("dashboard.snapshot_failures")
+    return df
 
 # Title
 st.title("📚 Math Foundations for ML & Data Science")
 st.markdown("Track your progress through the 16-week curriculum.")
 
 # Load Data
-if "df" not in st.session_state:
-    st.session_state.df = load_data()
-
-df = st.session_state.df
+# One copy-on-write schedule for all sessions, with its totals per Status/Track/Week
+# (updated from row deltas on save); a session's own changes live in its data editor until saved
+df, progress = load_data()
 
 # --- Sidebar: Filters & Summary ---
 st.sidebar.header("Filters")
-selected_week = st.sidebar.selectbox("Select Week", ["All"] + list(df["Week"].unique()))
+selected_week = st.sidebar.selectbox("Select Week", ["All"] + progress.weeks)
 
 # --- Metrics ---
-total_hours = df["Planned Hours"].sum()
-completed_hours = df[df["Status"] == "Done"]["Planned Hours"].sum()
-in_progress_hours = df[df["Status"] == "In Progress"]["Planned Hours"].sum() * 0.5 # Assume 50% done
-progress_pct = (completed_hours + in_progress_hours) / total_hours
+total_hours = progress.total_hours
+completed_hours = progress.completed_hours
+in_progress_hours = progress.in_progress_hours # Counted as 50% done
+progress_pct = progress.progress_pct
 
 col1, col2, col3 = st.columns(3)
-col1.metric("Total Hours Planned", f"{total_hours} h")
+col1.metric("Total Hours Planned", f"{total_hours:g} h")
 col2.metric("Hours Completed (Est.)", f"{completed_hours + in_progress_hours:.1f} h")
 col3.metric("Progress", f"{progress_pct:.1%}")
 
-st.progress(progress_pct)
+st.progress(min(progress_pct, 1.0))
 
 # --- Main Data Editor ---
 st.subheader("Weekly Schedule")
@@ -80,9 +175,12 @@ else:
     display_df = df
 
 # Edit Data
+# Row ids travel in a hidden "id" column: a non-range index would be shown
+# (and required for new rows) by data_editor. New rows come back with no id.
 edited_df = st.data_editor(
-    display_df,
+    display_df.reset_index(),
     column_config={
+        "id": None,
         "Status": st.column_config.SelectboxColumn(
             "Status",
             help="Current status of the module",
@@ -96,7 +194,7 @@ edited_df = st.data_editor(
     use_container_width=True,
     hide_index=True,
     num_rows="dynamic"
-)
+).set_index("id")
 
 # Save Button
 if st.button("Save Changes"):
@@ -105,59 +203,67 @@ if st.button("Save Changes"):
     # st.data_editor returns a new dataframe, we need to merge it back to the main source of truth
     
     if selected_week != "All":
-        # Update only the rows that were visible/edited
-        # We need to ensure we map back to the original indices if possible, 
-        # but since we hid index, we rely on the fact that we passed a filtered DF. 
-        # Actually data_editor with filtered DF just returns the filtered DF modified.
-        # We need to update the main st.session_state.df
-        
-        # Strategy: iterate over the edited_df and update st.session_state.df based on matching columns (Day, Track etc)
-        # Or simpler: Re-load full DF, update rows where Week == selected_week with edited_df values
-        
-        # But wait, data_editor doesn't return the index if hide_index=True? 
-        # Actually it returns a new DF with reset index if we aren't careful.
-        # Let's rely on mapping by Week + Track which should be unique key here.
-        
-        for index, row in edited_df.iterrows():
-            # Find matching row in main DF
-            mask = (st.session_state.df["Week"] == row["Week"]) & (st.session_state.df["Track"] == row["Track"])
-            st.session_state.df.loc[mask, "Status"] = row["Status"]
-            st.session_state.df.loc[mask, "Output Lab"] = row["Output Lab"]
-            # Update other fields if editable
-            
+        # Replace the visible rows (edited, added or deleted) in the full table.
+        new_df = pd.concat([df.drop(index=display_df.index), edited_df]).sort_index()
     else:
-        st.session_state.df = edited_df
+        new_df = edited_df
 
-    save_data(st.session_state.df)
-    st.success("✅ Progress saved to dashboard.csv!")
-    st.rerun()
+    # Every session sees the saved schedule on its next run. If another session
+    # saved since this run started, only this session's row changes are applied
+    try:
+        get_schedule().commit(new_df, save_data, base=df, version=progress.version)
+    except Exception:
+        st.error("Failed to save data. Check logs.")
+    else:
+        st.success("✅ Progress saved!")
+        st.rerun()
 
-# --- Tabs Layout ---
-# --- Tabs Layout ---
-st.divider()
-tab1, tab2, tab3, tab4, tab5 = st.tabs(["Analytics", "✍️ Scratchpad", "📚 Classroom", "🏋️ Practice Arena", "🚀 Simulation Lab"])
+# --- Sections Layout ---
+# Only the selected section runs, so each one's imports and computations
+# happen the first time it is opened (st.tabs would run every tab body).
 
-# --- Tab 1: Analytics ---
-with tab1:
-    st.subheader("Analytics")
+# --- Section 1: Analytics ---
+# Charts are built from the running aggregates, once per data version for all sessions
+@st.cache_resource(max_entries=2)
+def analytics_figures(version, _progress):
     # 1. Hours by Track
-    hours_by_track = df.groupby("Track")["Planned Hours"].sum().reset_index()
+    hours_by_track = pd.DataFrame(sorted(_progress.hours_by_track.items()), columns=["Track", "Planned Hours"])
     fig_track = px.bar(hours_by_track, x="Track", y="Planned Hours", title="Workload Distribution by Track")
-    st.plotly_chart(fig_track, use_container_width=True)
 
     # 2. Status Breakdown
-    status_counts = df["Status"].value_counts().reset_index()
-    status_counts.columns = ["Status", "Count"]
+    status_counts = pd.DataFrame(
+        sorted(_progress.count_by_status.items(), key=lambda item: item[1], reverse=True),
+        columns=["Status", "Count"]
+    )
     fig_status = px.pie(status_counts, values="Count", names="Status", title="Status Breakdown", hole=0.4)
+    return fig_track, fig_status
+
+def render_analytics():
+    st.subheader("Analytics")
+    fig_track, fig_status = analytics_figures(progress.version, progress)
+    st.plotly_chart(fig_track, use_container_width=True)
     st.plotly_chart(fig_status, use_container_width=True)
 
-# --- Tab 2: Scratchpad ---
-with tab2:
+# --- Section 2: Scratchpad ---
+CANVAS_WIDTH, CANVAS_HEIGHT = 800, 600
+NOTES_PER_ROW = 4
+NOTES_PER_PAGE = 12
+
+@st.cache_resource
+def get_note_store():
+    NoteStore = timed_import("src.core.notes").NoteStore
+    return NoteStore(NOTES_DIR)
+
+@st.cache_data(max_entries=32)
+def render_note_png(note_id):
+    return get_note_store().export_png(note_id)
+
+def render_scratchpad():
     st.subheader("✍️ Scratchpad")
     st.markdown("Use your Wacom tablet or mouse to solve problems or take notes.")
 
-    from streamlit_drawable_canvas import st_canvas
-    from PIL import Image
+    st_canvas = timed_import("streamlit_drawable_canvas").st_canvas
+    store = get_note_store()
 
     # Sidebar controls for drawing
     stroke_width = st.slider("Stroke width: ", 1, 25, 3)
@@ -170,53 +276,65 @@ with tab2:
         stroke_width=stroke_width,
         stroke_color=stroke_color,
         background_color=bg_color,
-        height=600,
-        width=800,
+        height=CANVAS_HEIGHT,
+        width=CANVAS_WIDTH,
         drawing_mode="freedraw",
         key="canvas",
     )
 
-    # Save to Notes
-    if canvas_result.image_data is not None:
+    # Save to Notes (strokes + thumbnail, not a full-size PNG)
+    if canvas_result.json_data is not None:
         if st.button("Save to Notes"):
-            if not os.path.exists(NOTES_DIR):
-                os.makedirs(NOTES_DIR)
-            
-            img_data = canvas_result.image_data
-            im = Image.fromarray(img_data.astype("uint8"), mode="RGBA")
-            
-            from datetime import datetime
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = os.path.join(NOTES_DIR, f"note_{timestamp}.png")
             try:
-                im.save(filename, "PNG")
-                st.success(f"Saved to {filename}!")
-                logger.info(f"Saved note: {filename}")
+                note_id = store.save(canvas_result.json_data, CANVAS_WIDTH, CANVAS_HEIGHT, background=bg_color)
+                st.success(f"Saved {note_id}!")
+            except ValueError as e:
+                st.warning(str(e))
             except Exception as e:
                 logger.error(f"Failed to save note: {e}")
                 st.error("Failed to save note.")
             
-    # Show saved notes
-    if os.path.exists(NOTES_DIR):
+    # Show saved notes: one page of thumbnails from the index
+    total = store.count()
+    if total:
         st.divider()
         st.subheader("Saved Notes")
-        note_files = sorted(os.listdir(NOTES_DIR), reverse=True)
-        if note_files:
-            selected_note = st.selectbox("View Note:", note_files)
-            if selected_note:
-                st.image(os.path.join(NOTES_DIR, selected_note), caption=selected_note)
-
-# --- Tab 3: Classroom ---
-with tab3:
+        pages = -(-total // NOTES_PER_PAGE)
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1) - 1
+        
+        cols = st.columns(NOTES_PER_ROW)
+        for i, entry in enumerate(store.page(page, NOTES_PER_PAGE)):
+            with cols[i % NOTES_PER_ROW]:
+                st.image(store.thumbnail_path(entry["id"]), caption=entry["created"])
+                if st.button("Open", key=f"open_{entry['id']}"):
+                    st.session_state.open_note = entry["id"]
+        
+        # Full resolution is rasterized only for the opened note
+        note_id = st.session_state.get("open_note")
+        if note_id:
+            try:
+                png = render_note_png(note_id)
+                st.image(png, caption=note_id)
+                st.download_button("Download PNG", png, file_name=f"{note_id}.png", mime="image/png")
+            except (KeyError, OSError) as e:
+                logger.error(f"Failed to open note {note_id}: {e}")
+                st.session_state.open_note = None
+
+# --- Section 3: Classroom ---
+@st.cache_data(max_entries=16)
+def render_lesson_figure(subject, topic):
+    # Streamlit caches the chart element with the result: later runs replay the
+    # serialized chart instead of serializing every animation frame again
+    figure = get_lesson_manager().get_figure(subject, topic)
+    if figure is not None:
+        st.plotly_chart(figure, use_container_width=True)
+
+def render_classroom():
     st.subheader("📚 Classroom")
     st.markdown("Interactive lessons to visualize mathematical concepts.")
     
-    from src.core.content import LessonManager
-    
-    if "lesson_manager" not in st.session_state:
-        st.session_state.lesson_manager = LessonManager()
-        
-    lm = st.session_state.lesson_manager
+    # Lessons hold no per-learner state, so one manager serves every session
+    lm = get_lesson_manager()
     lessons = lm.get_lessons()
     
     col_sel1, col_sel2 = st.columns(2)
@@ -225,72 +343,79 @@ with tab3:
     with col_sel2:
         topic = st.selectbox("Topic", lessons[subject])
         
+    # Lessons are built once per process; interactive figures (e.g. the
+    # derivative slider) animate precomputed frames in the browser
     content = lm.get_lesson_content(subject, topic)
     
     st.divider()
     st.markdown(f"## {content['title']}")
     st.markdown(content['markdown'])
     
-    if content['figure']:
-        # Interactive features for Calculus
-        if subject == "Calculus" and topic == "Derivatives Intuition":
-            x_val = st.slider("x value", -4.0, 4.0, 1.0, 0.1)
-            
-            # Re-generate figure based on slider (dynamic update)
-            import numpy as np
-            import plotly.graph_objects as go
-            
-            x = np.linspace(-5, 5, 100)
-            y = x**2
-            
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(x=x, y=y, mode='lines', name='f(x) = x^2'))
-            
-            x0 = x_val
-            y0 = x0**2
-            slope = 2*x0
-            y_tangent = slope * (x - x0) + y0
-            
-            fig.add_trace(go.Scatter(x=x, y=y_tangent, mode='lines', name=f'Tangent (Slope={slope:.1f})', line=dict(dash='dash', color='green')))
-            fig.add_trace(go.Scatter(x=[x0], y=[y0], mode='markers', name='Point', marker=dict(size=12, color='red')))
-            
-            fig.update_layout(title=f"Derivative at x={x0}", xaxis_title="x", yaxis_title="f(x)", 
-                              yaxis_range=[-5, 25])
-            st.plotly_chart(fig, use_container_width=True)
-            
-        else:
-            st.plotly_chart(content['figure'], use_container_width=True)
+    if content['figure_json']:
+        render_lesson_figure(subject, topic)
 
-# --- Tab 4: Practice Arena ---
-with tab4:
+# --- Section 4: Practice Arena ---
+def render_practice():
     st.subheader("🏋️ Practice Arena")
     st.markdown("Infinite practice problems generated on the fly.")
 
     # Import generator inside the app to avoid circular imports if any
     try:
-        from src.core.modules.math_foundations.generator import MathGenerator
+        # Categories come from the plugin manifest; each generator module is imported on first use
+        get_registry = timed_import("src.core.plugins").get_registry
         
-        if "generator" not in st.session_state:
-            st.session_state.generator = MathGenerator()
+        # Problems come from a shared pool refilled in the background
+        pool = get_problem_pool()
         
-        category = st.selectbox("Select Topic:", ["Calculus (Derivatives)", "Linear Algebra (Dot Product)"])
+        category = st.selectbox("Select Topic:", list(get_registry().categories()) + [ADAPTIVE_TOPIC])
+        scheduler = get_scheduler(session_learner())
         
         if st.button("New Problem"):
-            st.session_state.current_problem = st.session_state.generator.get_problem(category)
+            if category == ADAPTIVE_TOPIC:
+                # next() is None only when no skill is registered; practise anything then
+                topic, difficulty = scheduler.next() or (random.choice(list(get_registry().categories())), None)
+            else:
+                topic, difficulty = category, None
+            problem = st.session_state.current_problem = pool.get_problem(topic, difficulty)
+            # Every first checked answer is logged for the scheduler, whichever topic was picked
+            st.session_state.current_attempt = {"category": topic, "level": problem.difficulty,
+                                                "shown": time.time(), "recorded": False}
         
         if "current_problem" in st.session_state:
             problem = st.session_state.current_problem
+            attempt = st.session_state.get("current_attempt")
             st.markdown("### Question:")
-            st.latex(problem.get("question", ""))
+            if attempt and category == ADAPTIVE_TOPIC:
+                st.caption(f"Review: {attempt['category']} · level {attempt['level']}")
+            st.latex(problem.question)
+            
+            # Check the learner's own answer (numeric sampling, exact fallback)
+            # Matrix and eigenvalue answers are typed as plain numbers
+            placeholder = "e.g. 1 2; 3 4" if isinstance(problem.serialized_answer, list) else "e.g. 6x/(x^2+1)"
+            submission = st.text_input("Your answer:", placeholder=placeholder)
+            if st.button("Check Answer") and submission:
+                verdict = get_answer_checker().check(problem, submission)
+                if attempt and not attempt["recorded"] and verdict["method"] != "invalid":
+                    scheduler.record(attempt["category"], attempt["level"], verdict["correct"],
+                                     time.time() - attempt["shown"])
+                    attempt["recorded"] = True
+                if verdict["correct"]:
+                    st.success(verdict["message"])
+                else:
+                    st.error(verdict["message"])
             
             with st.expander("Show Answer"):
                 st.markdown("### Answer:")
-                st.latex(problem.get("answer", ""))
+                st.latex(problem.answer)
+
+        if category == ADAPTIVE_TOPIC:
+            with st.expander(f"📊 Review schedule ({scheduler.due_count()} due, {scheduler.total_attempts} attempts)"):
+                st.dataframe(pd.DataFrame(scheduler.summary()), hide_index=True, use_container_width=True)
     except ImportError:
         st.error("Generator module not found. Check src/core/modules/math_foundations/generator.py")
 
-# --- Tab 5: Simulation Lab ---
-with tab5:
+# --- Section 5: Simulation Lab ---
+def render_simulation():
     st.subheader("🚀 Rocket Trajectory Simulator")
     st.markdown("Experiment with Physics and Calculus by launching virtual rockets.")
     
@@ -309,9 +434,11 @@ with tab5:
         if launch:
             # Run Simulation
             try:
-                from src.core.modules.physics.simulation import RocketSimulator
+                RocketSimulator = timed_import("src.core.modules.physics.simulation").RocketSimulator
+                downsample = timed_import("src.core.modules.physics.downsample").downsample
                 sim = RocketSimulator(dry_mass, fuel_mass, thrust, burn_time)
-                results = sim.run()
+                sim_cache = get_simulation_cache()
+                results = sim_cache.get_or_compute(sim.cache_key(), lambda: sim.run().freeze())
                 
                 # Metrics
                 max_alt = results["Altitude (m)"].max()
@@ -323,13 +450,155 @@ with tab5:
                 m2.metric("Top Speed", f"{max_vel:.1f} m/s")
                 m3.metric("Flight Duration", f"{flight_time:.1f} s")
                 
-                # Plot
-                fig = px.line(results, x="Time (s)", y=["Altitude (m)", "Velocity (m/s)"], 
+                # Plot (metrics above use the full-resolution results)
+                plotted = downsample(results, SIM_CHART_POINTS)
+                fig = px.line(plotted.to_dataframe(), x="Time (s)", y=["Altitude (m)", "Velocity (m/s)"], 
                               title="Flight Telemetry", labels={"value": "Magnitude"})
                 st.plotly_chart(fig, use_container_width=True)
+
+                stats = sim_cache.stats()
+                st.caption(f"Plotted {len(plotted)} of {len(results)} samples. "
+                           f"Simulation cache: {stats['hits']} hits, {stats['misses']} misses, "
+                           f"{stats['entries']} entries ({stats['bytes'] / 1024:.0f} KiB)")
                 
             except ImportError:
                  st.error("Physics module not found. Check src/core/modules/physics/simulation.py")
         else:
              st.info("Adjust parameters and click Launch to see the flight path.")
 
+# --- Section 6: Performance ---
+def render_performance():
+    st.subheader("📈 Performance")
+    st.markdown("Timings of the app's hot paths over the most recent samples (shared by all sessions).")
+
+    enabled = st.toggle("Collect metrics", value=metrics.is_enabled())
+    if enabled != metrics.is_enabled():
+        metrics.set_enabled(enabled)
+
+    stats = metrics.summary()
+    if stats:
+        rows = [
+            {"Metric": name, "Unit": s["unit"], "Samples": s["count"], "Mean": s["mean"],
+             "p50": s["p50"], "p95": s["p95"], "p99": s["p99"], "Max": s["max"]}
+            for name, s in stats.items()
+        ]
+        st.dataframe(
+            pd.DataFrame(rows), hide_index=True, use_container_width=True,
+            column_config={col: st.column_config.NumberColumn(format="%.2f")
+                           for col in ("Mean", "p50", "p95", "p99", "Max")}
+        )
+    else:
+        st.info("No samples yet. Use the other sections to collect some.")
+
+    counts = metrics.counters()
+    if counts:
+        st.dataframe(pd.DataFrame(list(counts.items()), columns=["Counter", "Value"]),
+                     hide_index=True, use_container_width=True)
+
+    col_dump, col_reset = st.columns(2)
+    if col_dump.button("Write JSON report"):
+        metrics.dump_json(METRICS_FILE)
+        st.success(f"Wrote {os.path.normpath(METRICS_FILE)}")
+    if col_reset.button("Reset metrics"):
+        metrics.reset()
+        st.rerun()
+    st.caption(f"The report is also written every {METRICS_DUMP_INTERVAL:g} s.")
+
+# --- Section 7: Cohort Analytics ---
+COHORT_CACHE_SECONDS = 60
+
+@st.cache_data(ttl=COHORT_CACHE_SECONDS, max_entries=4)
+def cohort_completion():
+    return get_warehouse().completion()
+
+@st.cache_data(ttl=COHORT_CACHE_SECONDS, max_entries=4)
+def cohort_learners():
+    # Learners with at least one snapshot: the population completion() covers
+    return len(get_warehouse().latest_files())
+
+@st.cache_data(ttl=COHORT_CACHE_SECONDS, max_entries=4)
+def cohort_burndown():
+    return get_warehouse().burndown()
+
+def render_cohort():
+    st.subheader("👥 Cohort Analytics")
+    st.markdown("Progress of every learner in the warehouse; each saved schedule is a snapshot.")
+
+    completion = cohort_completion()
+    if completion.empty:
+        st.info("No snapshots yet. Saving the schedule records one.")
+        return
+
+    planned = completion["planned_hours"].sum()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Learners", f"{cohort_learners()}")
+    col2.metric("Hours Planned", f"{planned:,.0f} h")
+    col3.metric("Cohort Progress", f"{completion['done_hours'].sum() / planned:.1%}" if planned else "–")
+
+    heatmap = completion.pivot(index="track", columns="week", values="completion")
+    fig_heat = px.imshow(heatmap, zmin=0, zmax=1, color_continuous_scale="Greens", aspect="auto",
+                         labels={"x": "Week", "y": "Track", "color": "Completion"},
+                         title="Completion by Week and Track (latest snapshot per learner)")
+    st.plotly_chart(fig_heat, use_container_width=True)
+
+    burndown = cohort_burndown()
+    fig_burn = px.line(burndown.reset_index(names="Date"), x="Date", y="remaining_hours", markers=True,
+                       labels={"remaining_hours": "Hours Remaining"}, title="Cohort Hours Burn-down")
+    st.plotly_chart(fig_burn, use_container_width=True)
+    st.caption(f"Cached for {COHORT_CACHE_SECONDS} s.")
+
+SECTIONS = {
+    "Analytics": render_analytics,
+    "✍️ Scratchpad": render_scratchpad,
+    "📚 Classroom": render_classroom,
+    "🏋️ Practice Arena": render_practice,
+    "🚀 Simulation Lab": render_simulation,
+    "👥 Cohort": render_cohort,
+    "📈 Performance": render_performance,
+}
+
+st.divider()
+section = st.radio("Section", list(SECTIONS), horizontal=True, label_visibility="collapsed", key="section")
+render_section = SECTIONS[section]
+with metrics.timer(f"section.{render_section.__name__}"):
+    render_section()
+
+# --- Startup Report ---
+run_ms = (time.perf_counter() - RUN_START) * 1000
+if "first_paint_ms" not in st.session_state:
+    st.session_state.first_paint_ms = run_ms
+    st.session_state.process_first_paint_ms = (time.perf_counter() - PROCESS_START) * 1000
+
+with st.sidebar.expander("⏱️ Startup report"):
+    st.caption(f"This run: {run_ms:.0f} ms")
+    st.caption(f"First paint (this session): {st.session_state.first_paint_ms:.0f} ms, "
+               f"{st.session_state.process_first_paint_ms:.0f} ms since process start")
+    imports = import_report()
+    if imports:
+        st.dataframe(
+            pd.DataFrame(imports, columns=["Module", "First import (ms)"]),
+            hide_index=True, use_container_width=True
+        )
+
+# --- Session Memory Report ---
+with st.sidebar.expander("🧠 Session memory"):
+    # Walking the schedule and session state takes a while, so it only runs while switched on
+    if st.toggle("Measure memory", key="measure_memory"):
+        deep_sizeof = timed_import("src.utils.memory").deep_sizeof
+        # Shared objects are sized first, so session entries pointing into them are not counted twice
+        seen = set()
+        shared_bytes = deep_sizeof((df, progress), seen)
+        entries = [(key, deep_sizeof(st.session_state[key], seen)) for key in st.session_state]
+        session_bytes = sum(size for _, size in entries)
+        st.caption(f"This session: {session_bytes / 1024:.1f} KiB. "
+                   f"Shared by all sessions: schedule {shared_bytes / 1024:.1f} KiB, "
+                   f"which each session used to load its own copy of.")
+        problem = st.session_state.get("current_problem")
+        if problem is not None:
+            st.caption(f"Current problem: {deep_sizeof(problem) / 1024:.1f} KiB as a compact record, "
+                       f"{deep_sizeof(problem.to_dict()) / 1024:.1f} KiB with a live sympy answer.")
+        if entries:
+            st.dataframe(
+                pd.DataFrame(sorted(entries, key=lambda entry: entry[1], reverse=True), columns=["Entry", "Bytes"]),
+                hide_index=True, use_container_width=True
+            )
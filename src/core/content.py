@@ -1,18 +1,58 @@
+import threading
+
 import plotly.graph_objects as go
+import plotly.io as pio
 import numpy as np
 
+from src.core.plugins import get_registry
+from src.utils.metrics import timed
+
+# Positions of the point on the derivative lesson's slider (one animation frame each)
+TANGENT_POINTS = np.round(np.arange(-4.0, 4.0 + 1e-9, 0.1), 1)
+
 class LessonManager:
+    # (subject, topic) -> lesson content, built once per process and shared by all instances
+    _cache = {}
+    _cache_lock = threading.Lock()
+
     def get_lessons(self):
-        return {
-            "Calculus": ["Derivatives Intuition", "Integrals Intuition"],
-            "Linear Algebra": ["Vector Operations", "Dot Product Intuition"]
-        }
+        """{subject: [topics]} from the registered lesson plugins."""
+        return get_registry().lessons()
 
+    @timed("lessons.get_lesson_content")
     def get_lesson_content(self, subject, topic):
-        if subject == "Calculus" and topic == "Derivatives Intuition":
-            return self._calculus_derivative_lesson()
-        elif subject == "Linear Algebra" and topic == "Vector Operations":
-            return self._linalg_vector_lesson()
+        """
+        Lesson content: {"title", "markdown", "figure_json"}.
+        Lessons are static, so each is built (and its figure serialized) once;
+        the returned dict is shared and must not be modified. Only the JSON is
+        kept, so no caller holds a figure another caller can mutate; see get_figure.
+        """
+        key = (subject, topic)
+        content = self._cache.get(key)
+        if content is None:
+            with self._cache_lock:
+                content = self._cache.get(key)
+                if content is None:
+                    content = self.build_lesson(subject, topic)
+                    figure = content.pop("figure")
+                    content["figure_json"] = figure.to_json() if figure else None
+                    self._cache[key] = content
+        return content
+
+    def get_figure_json(self, subject, topic):
+        """Serialized Plotly figure of a lesson (None if it has none), from the lesson cache."""
+        return self.get_lesson_content(subject, topic)["figure_json"]
+
+    def get_figure(self, subject, topic):
+        """A new Plotly figure of a lesson, rebuilt from the cached JSON (None if it has none)."""
+        figure_json = self.get_figure_json(subject, topic)
+        return pio.from_json(figure_json, skip_invalid=True) if figure_json else None
+
+    def build_lesson(self, subject, topic):
+        """Builds a lesson from scratch (uncached)."""
+        build = get_registry().lesson(subject, topic)
+        if build is not None:
+            return build(self)
         else:
             return {
                 "title": "Coming Soon",
@@ -21,24 +61,55 @@ class LessonManager:
             }
 
     def _calculus_derivative_lesson(self):
+        """
+        f(x) = x^2 with its tangent line at a point picked by a slider built
+        into the figure. Every slider position is a precomputed animation
+        frame, so scrubbing runs in the browser without rerunning the app.
+        """
         # Data for x^2
         x = np.linspace(-5, 5, 100)
         y = x**2
-        
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(x=x, y=y, mode='lines', name='f(x) = x^2'))
-        
+        x_ends = np.array([x[0], x[-1]]) # The tangent is a straight line, so its ends suffice
+
+        def tangent_traces(x0):
+            y0 = x0**2
+            slope = 2*x0
+            # Tangent line: y - y0 = m(x - x0) => y = m(x - x0) + y0
+            y_tangent = slope * (x_ends - x0) + y0
+            return [
+                go.Scatter(x=x_ends, y=y_tangent, mode='lines', name='Tangent Line', line=dict(dash='dash', color='green')),
+                go.Scatter(x=[x0], y=[y0], mode='markers', name='Point (x, f(x))', marker=dict(size=12, color='red')),
+            ]
+
+        def title(x0):
+            return f"Derivative at x={x0:.1f}: slope = {2*x0:.1f}"
+
         # Initial tangent at x=1
-        x0 = 1
-        y0 = x0**2
-        slope = 2*x0
-        # Tangent line: y - y0 = m(x - x0) => y = m(x - x0) + y0
-        y_tangent = slope * (x - x0) + y0
-        
-        fig.add_trace(go.Scatter(x=x, y=y_tangent, mode='lines', name='Tangent Line', line=dict(dash='dash')))
-        fig.add_trace(go.Scatter(x=[x0], y=[y0], mode='markers', name='Point (x, f(x))', marker=dict(size=10, color='red')))
-        
-        fig.update_layout(title="Visualizing the Derivative (Slope)", xaxis_title="x", yaxis_title="f(x)")
+        x_start = 1.0
+        fig = go.Figure(
+            data=[go.Scatter(x=x, y=y, mode='lines', name='f(x) = x^2')] + tangent_traces(x_start),
+            frames=[
+                # Only the tangent and the point (traces 1 and 2) change between frames
+                go.Frame(name=f"{x0:.1f}", data=tangent_traces(x0), traces=[1, 2], layout=dict(title=title(x0)))
+                for x0 in TANGENT_POINTS
+            ],
+        )
+
+        fig.update_layout(
+            title=title(x_start), xaxis_title="x", yaxis_title="f(x)", yaxis_range=[-5, 25],
+            sliders=[dict(
+                active=int(np.argmin(np.abs(TANGENT_POINTS - x_start))),
+                currentvalue=dict(prefix="x value: ", font=dict(color="#444")),
+                font=dict(color="rgba(0,0,0,0)"), # 81 tick labels would overlap; the current value is shown above
+                pad=dict(t=40),
+                steps=[
+                    dict(label=f"{x0:.1f}", method="animate",
+                         args=[[f"{x0:.1f}"], dict(mode="immediate", frame=dict(duration=0, redraw=True),
+                                                   transition=dict(duration=0))])
+                    for x0 in TANGENT_POINTS
+                ],
+            )],
+        )
         
         return {
             "title": "Calculus: The Derivative is a Slope",
@@ -1,17 +1,77 @@
+import atexit
+import gzip
+import json
 import logging
+import logging.handlers
 import os
-from datetime import datetime
+import queue
+import shutil
+import threading
+from datetime import datetime, timezone
+
+# Attributes every LogRecord has; anything else was passed via extra= and is kept in JSON output
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message plus any extra= fields."""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        return json.dumps(entry, default=str)
+
+
+def _gzip_namer(name):
+    return name + ".gz"
+
+
+def _gzip_rotator(source, dest):
+    with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+def _env_flag(name, default=False):
+    value = os.environ.get(name)
+    return default if value is None else value.lower() in ("1", "true", "yes", "on")
+
 
 class Logger:
     _instance = None
 
-    def __new__(cls, log_file="logs/app.log", level=logging.INFO):
+    def __new__(cls, log_file="logs/app.log", level=logging.INFO, use_queue=None, rotation=None,
+                max_bytes=5 * 1024 * 1024, backup_count=5, when="midnight", compress=True, json_lines=None):
+        """
+        Process-wide logger for "MathApp". Only the first call configures it.
+        use_queue: Callers only enqueue records; a background thread does the I/O
+        rotation: None (single file), "size" (max_bytes) or "time" (when, e.g. "midnight")
+        backup_count: Rotated files to keep; compress gzips them
+        json_lines: Write the log file as JSON lines instead of plain text
+        use_queue, rotation and json_lines default to the MATHAPP_LOG_QUEUE,
+        MATHAPP_LOG_ROTATION and MATHAPP_LOG_JSON environment variables.
+        """
         if cls._instance is None:
             cls._instance = super(Logger, cls).__new__(cls)
-            cls._instance._initialize(log_file, level)
+            cls._instance._initialize(
+                log_file, level,
+                _env_flag("MATHAPP_LOG_QUEUE") if use_queue is None else use_queue,
+                os.environ.get("MATHAPP_LOG_ROTATION") if rotation is None else rotation,
+                max_bytes, backup_count, when, compress,
+                _env_flag("MATHAPP_LOG_JSON") if json_lines is None else json_lines,
+            )
         return cls._instance
 
-    def _initialize(self, log_file, level):
+    def _initialize(self, log_file, level, use_queue, rotation, max_bytes, backup_count, when, compress, json_lines):
         # Create logs directory if it doesn't exist
         log_dir = os.path.dirname(log_file)
         if not os.path.exists(log_dir) and log_dir:
@@ -20,6 +80,9 @@ class Logger:
         # Create logger
         self.logger = logging.getLogger("MathApp")
         self.logger.setLevel(level)
+        self.listener = None
+        self.listening = False # Whether the listener thread runs; QueueListener does not say publicly
+        self._listener_lock = threading.Lock()
 
         # Formatter
         formatter = logging.Formatter(
@@ -27,16 +90,56 @@ class Logger:
         )
 
         # File Handler
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setFormatter(formatter)
-        self.logger.addHandler(file_handler)
+        if rotation == "size":
+            file_handler = logging.handlers.RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count)
+        elif rotation == "time":
+            file_handler = logging.handlers.TimedRotatingFileHandler(log_file, when=when, backupCount=backup_count)
+        elif rotation in (None, "", "none"):
+            file_handler = logging.FileHandler(log_file)
+        else:
+            raise ValueError(f"Unknown log rotation: {rotation}")
+        if rotation in ("size", "time") and compress:
+            file_handler.namer = _gzip_namer
+            file_handler.rotator = _gzip_rotator
+        file_handler.setFormatter(JsonFormatter() if json_lines else formatter)
 
         # Console Handler
         console_handler = logging.StreamHandler()
         console_handler.setFormatter(formatter)
-        self.logger.addHandler(console_handler)
+
+        self.handlers = [file_handler, console_handler]
+        if use_queue:
+            # Callers only enqueue; the listener thread formats and writes
+            records = queue.SimpleQueue()
+            self.listener = logging.handlers.QueueListener(records, *self.handlers, respect_handler_level=True)
+            self.listener.start()
+            self.listening = True
+            self.logger.addHandler(logging.handlers.QueueHandler(records))
+            atexit.register(self.shutdown)
+        else:
+            for handler in self.handlers:
+                self.logger.addHandler(handler)
 
     def get_logger(self):
         return self.logger
 
+    def flush(self):
+        """Blocks until every queued record has been written."""
+        with self._listener_lock:
+            if self.listening:
+                self.listener.stop() # Drains the queue
+                self.listener.start()
+        for handler in self.handlers:
+            handler.flush()
+
+    def shutdown(self):
+        """Drains the queue, stops the listener thread and closes the handlers."""
+        with self._listener_lock:
+            if self.listening:
+                self.listener.stop()
+                self.listening = False
+        for handler in self.handlers:
+            handler.flush()
+            handler.close()
+
 # Usage: log = Logger().get_logger()
@@ -0,0 +1,101 @@
+"""
+Bulk, reproducible problem generation for worksheets and exam banks.
+
+Problems are produced in fixed-size chunks. Chunk i always uses its own
+random stream derived from (seed, i), so the output for a given seed is
+identical whatever the number of worker processes. Results are streamed in
+order, one JSON object per line, so memory use stays bounded.
+
+Usage:
+    python -m src.core.modules.math_foundations.bulk "Calculus (Derivatives)" 100000 --seed 42 --workers 8 -o bank.jsonl
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+
+from src.core.modules.math_foundations.generator import MathGenerator
+from src.core.modules.math_foundations.problem import serialize_answer
+
+CHUNK_SIZE = 256
+
+
+def serialize_problem(problem, problem_id=None):
+    """JSON-ready copy of a problem, with sympy answers stored as srepr strings."""
+    record = dict(problem)
+    if "raw_answer" in record:
+        record["raw_answer"] = serialize_answer(record["raw_answer"])
+    if problem_id is not None:
+        record["id"] = problem_id
+    return record
+
+
+def _generate_chunk(task):
+    """Generates one chunk of problems as JSON lines. Runs in a worker process."""
+    category, seed, index, start, count = task
+    generator = MathGenerator(seed=f"{seed}:{index}")
+    return [
+        json.dumps(serialize_problem(generator.get_problem(category), start + i))
+        for i in range(count)
+    ]
+
+
+def _tasks(category, n, seed, chunk_size):
+    for index, start in enumerate(range(0, n, chunk_size)):
+        yield category, seed, index, start, min(chunk_size, n - start)
+
+
+def generate_batch_lines(category, n, seed=0, workers=None, chunk_size=CHUNK_SIZE):
+    """Yields n problems as JSON lines, in order. workers=1 runs in-process."""
+    if category not in MathGenerator.categories():
+        raise ValueError(f"Unknown category: {category}")
+    workers = workers or os.cpu_count() or 1
+    tasks = _tasks(category, n, seed, chunk_size)
+    if workers == 1:
+        for task in tasks:
+            yield from _generate_chunk(task)
+        return
+    with multiprocessing.Pool(workers) as pool:
+        # imap keeps chunk order, so output does not depend on scheduling
+        for lines in pool.imap(_generate_chunk, tasks):
+            yield from lines
+
+
+def generate_batch(category, n, seed=0, workers=None, chunk_size=CHUNK_SIZE):
+    """Yields n serialized problem dicts, deterministic for a given seed."""
+    for line in generate_batch_lines(category, n, seed, workers, chunk_size):
+        yield json.loads(line)
+
+
+def write_jsonl(path, category, n, seed=0, workers=None, chunk_size=CHUNK_SIZE):
+    """Streams n problems to a JSONL file ("-" for stdout). Returns the number written."""
+    out = sys.stdout if path == "-" else open(path, "w", encoding="utf-8")
+    written = 0
+    try:
+        for line in generate_batch_lines(category, n, seed, workers, chunk_size):
+            out.write(line + "\n")
+            written += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a reproducible bank of practice problems as JSONL.")
+    parser.add_argument("category", choices=MathGenerator.categories())
+    parser.add_argument("n", type=int, help="Number of problems")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("-o", "--output", default="-", help="Output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    written = write_jsonl(args.output, args.category, args.n, args.seed, args.workers, args.chunk_size)
+    if args.output != "-":
+        print(f"Wrote {written} problems to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
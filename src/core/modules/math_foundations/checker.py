@@ -0,0 +1,269 @@
+import io
+import re
+import tokenize
+from fractions import Fraction
+
+import numpy as np
+
+from src.core.modules.math_foundations.problem import Problem
+from src.utils.cache import LRUCache
+from src.utils.startup import LazyModule, timed_import
+
+sp = LazyModule("sympy")
+
+# Characters a learner's answer may contain; anything else is rejected before parsing
+ALLOWED_INPUT = re.compile(r"^[\w\s+\-*/^().,]*$")
+
+# parse_expr evaluates its input as Python, so every token is checked first:
+# operators from this set, numbers, and the names below (or runs of one-letter
+# names such as "xe", which implicit multiplication splits into x*e). No
+# attribute access, keywords or other names get through.
+ALLOWED_OPERATORS = {"+", "-", "*", "/", "**", "^", "(", ")", ","}
+FUNCTION_NAMES = ("sin", "cos", "tan", "cot", "sec", "csc", "asin", "acos", "atan",
+                  "sinh", "cosh", "tanh", "exp", "log", "sqrt", "Abs")
+CONSTANT_NAMES = ("x", "e", "ln", "pi")
+IGNORED_TOKENS = {tokenize.NEWLINE, tokenize.NL, tokenize.ENDMARKER}
+
+# sympy computes integer powers exactly, so 9^9^9 would never finish: answers are
+# short, powers cannot be chained or appear inside an exponent, an exponent holds
+# at most MAX_EXPONENT_NUMBERS numbers of at most MAX_EXPONENT each, and powers of
+# powers nest at most MAX_POWER_NESTING deep
+MAX_ANSWER_LENGTH = 200
+MAX_EXPONENT = 12
+MAX_EXPONENT_NUMBERS = 2
+MAX_POWER_NESTING = 2
+POWER_OPERATORS = {"^", "**"}
+
+# Leading "f'(x) =" / "y =" that learners often copy from the question
+ANSWER_PREFIX = re.compile(r"^\s*(f'\s*\(\s*x\s*\)|y'?|dy/dx)\s*=")
+
+# Matrix and list answers: numbers separated by spaces, commas, ";" or brackets, e.g. "1 2; 3 4"
+ALLOWED_VALUES_INPUT = re.compile(r"^[\d\s+\-./,;\[\]()]*$")
+NUMBER = re.compile(r"-?\d+(?:\.\d+)?(?:/\d+)?")
+
+
+class AnswerChecker:
+    def __init__(self, samples=64, sample_range=(-5.0, 5.0), rtol=1e-6, atol=1e-8, min_valid=8, seed=0, cache_size=1024):
+        """
+        Numeric answer checker for MathGenerator problems.
+        samples: Number of random points each expression is evaluated on
+        sample_range: Interval the points are drawn from
+        rtol, atol: Tolerances for comparing values at each point
+        min_valid: Fewer valid points than this (domain issues) falls back to exact comparison
+        cache_size: Number of compiled reference answers kept
+        """
+        self.rtol = rtol
+        self.atol = atol
+        self.min_valid = min_valid
+        self.points = np.random.default_rng(seed).uniform(*sample_range, size=samples)
+        self._references = LRUCache(max_entries=cache_size)
+
+    @property
+    def x(self):
+        return sp.Symbol('x')
+
+    def local_dict(self):
+        names = {name: getattr(sp, name) for name in FUNCTION_NAMES}
+        names.update({"x": self.x, "e": sp.E, "ln": sp.log, "pi": sp.pi})
+        return names
+
+    @staticmethod
+    def global_dict():
+        """Namespace parse_expr evaluates in: no builtins, only what its transformations emit."""
+        return {"__builtins__": {}, "Integer": sp.Integer, "Float": sp.Float, "Rational": sp.Rational,
+                "Symbol": sp.Symbol, "Function": sp.Function, "Add": sp.Add, "Mul": sp.Mul, "Pow": sp.Pow}
+
+    @classmethod
+    def _check_tokens(cls, text, names):
+        """
+        Raises ValueError unless every token of text is an allowed operator, a
+        number or a known name, and its powers are within the limits above.
+        """
+        letters = {name for name in names if len(name) == 1}
+        unknown = set()
+        tokens = []
+        try:
+            for token in tokenize.generate_tokens(io.StringIO(text).readline):
+                if token.type in IGNORED_TOKENS:
+                    continue
+                tokens.append(token)
+                if token.type == tokenize.NUMBER:
+                    continue
+                if token.type == tokenize.OP and token.string in ALLOWED_OPERATORS:
+                    continue
+                if token.type == tokenize.NAME:
+                    if token.string not in names and not set(token.string) <= letters:
+                        unknown.add(token.string)
+                    continue
+                raise ValueError(f"Unsupported input: {token.string!r}")
+        except tokenize.TokenError:
+            raise ValueError("Could not parse answer: unbalanced parentheses.")
+        except SyntaxError as e:
+            raise ValueError(f"Could not parse answer: {e}")
+        if unknown:
+            raise ValueError(f"Unknown symbols: {', '.join(sorted(unknown))}")
+        cls._check_exponents(tokens)
+
+    @staticmethod
+    def _check_exponents(tokens):
+        """Raises ValueError for chained powers, powers in exponents and large exponents."""
+        i = 0
+        while i < len(tokens):
+            if tokens[i].string not in POWER_OPERATORS:
+                i += 1
+                continue
+            # The exponent: a sign, then one number or name, or a parenthesized group / function call
+            end = i + 1
+            while end < len(tokens) and tokens[end].string in ("+", "-"):
+                end += 1
+            if end < len(tokens) and tokens[end].type == tokenize.NAME and end + 1 < len(tokens) \
+                    and tokens[end + 1].string == "(":
+                end += 1
+            if end < len(tokens) and tokens[end].string == "(":
+                depth = 0
+                while end < len(tokens):
+                    depth += {"(": 1, ")": -1}.get(tokens[end].string, 0)
+                    if depth == 0:
+                        break
+                    end += 1
+            exponent = tokens[i + 1:end + 1]
+            if any(token.string in POWER_OPERATORS for token in exponent):
+                raise ValueError("Powers inside an exponent are not supported.")
+            numbers = [token.string for token in exponent if token.type == tokenize.NUMBER]
+            if len(numbers) > MAX_EXPONENT_NUMBERS or any(abs(complex(n)) > MAX_EXPONENT for n in numbers):
+                raise ValueError(f"Exponents are limited to small numbers (at most {MAX_EXPONENT}).")
+            if end + 1 < len(tokens) and tokens[end + 1].string in POWER_OPERATORS:
+                raise ValueError("Chained powers (a^b^c) are not supported; use parentheses.")
+            i = end + 1
+
+    @staticmethod
+    def _power_nesting(expr):
+        """Deepest chain of powers whose base contains another power."""
+        if not expr.args:
+            return 0
+        inner = max(AnswerChecker._power_nesting(arg) for arg in expr.args)
+        return inner + 1 if isinstance(expr, sp.Pow) else inner
+
+    @classmethod
+    def screen(cls, text):
+        """
+        Checks a learner's answer before anything is parsed (length, characters,
+        tokens and powers) and returns it without "$" and copied prefixes.
+        Raises ValueError if it is rejected. Does not need sympy, so a server can
+        run it before handing the answer to a worker.
+        """
+        text = text.strip().strip("$")
+        text = ANSWER_PREFIX.sub("", text).strip()
+        if not text:
+            raise ValueError("Empty answer.")
+        if len(text) > MAX_ANSWER_LENGTH:
+            raise ValueError(f"Answer is too long (at most {MAX_ANSWER_LENGTH} characters).")
+        if not ALLOWED_INPUT.match(text) or "__" in text:
+            raise ValueError("Answer contains unsupported characters.")
+        cls._check_tokens(text, set(FUNCTION_NAMES + CONSTANT_NAMES))
+        return text
+
+    def parse(self, text):
+        """Parses a learner's answer into a sympy expression. Raises ValueError if it cannot."""
+        text = self.screen(text)
+        local_dict = self.local_dict()
+        parser = timed_import("sympy.parsing.sympy_parser")
+        transformations = parser.standard_transformations + (
+            parser.implicit_multiplication_application, parser.convert_xor
+        )
+        try:
+            # Left unevaluated: the numeric check only needs the tree, and nothing is computed exactly
+            expr = parser.parse_expr(text, local_dict=local_dict, global_dict=self.global_dict(),
+                                     transformations=transformations, evaluate=False)
+        except Exception as e:
+            raise ValueError(f"Could not parse answer: {e}")
+        if not isinstance(expr, sp.Expr):
+            raise ValueError("Answer is not a mathematical expression.")
+        if self._power_nesting(expr) > MAX_POWER_NESTING:
+            raise ValueError(f"Powers of powers are limited to {MAX_POWER_NESTING} levels.")
+        extra = expr.free_symbols - {self.x}
+        if extra:
+            raise ValueError(f"Unknown symbols: {', '.join(sorted(map(str, extra)))}")
+        return expr
+
+    def _evaluate(self, expr):
+        """Values of expr at the sample points (NaN where undefined)."""
+        func = sp.lambdify(self.x, expr, modules="numpy")
+        with np.errstate(all="ignore"):
+            values = np.asarray(func(self.points), dtype=complex)
+        values = np.broadcast_to(values, self.points.shape)
+        # Points where the expression leaves the reals count as undefined
+        real = np.where(np.abs(values.imag) <= self.atol, values.real, np.nan)
+        return real
+
+    def _reference(self, raw_answer):
+        return self._references.get_or_compute(raw_answer, lambda: self._evaluate(sp.sympify(raw_answer)))
+
+    def _check_values(self, raw_answer, submission):
+        """
+        Compares the numbers in a submission with a list answer. Nested lists
+        (matrices) are compared entry by entry in row order, flat lists
+        (eigenvalues) in any order.
+        """
+        text = submission.strip().strip("$")
+        if not ALLOWED_VALUES_INPUT.match(text):
+            return {"correct": False, "method": "invalid", "message": "Enter numbers only, e.g. 1 2; 3 4"}
+        try:
+            actual = [float(Fraction(value)) for value in NUMBER.findall(text)]
+        except (ValueError, ZeroDivisionError) as e:
+            return {"correct": False, "method": "invalid", "message": f"Could not read answer: {e}"}
+
+        matrix = bool(raw_answer) and isinstance(raw_answer[0], (list, tuple))
+        if matrix:
+            expected = [float(value) for row in raw_answer for value in row]
+        else:
+            expected = sorted(float(value) for value in raw_answer)
+            actual.sort()
+        if len(actual) != len(expected):
+            return {"correct": False, "method": "invalid", "message": f"Expected {len(expected)} numbers, got {len(actual)}."}
+
+        correct = bool(np.allclose(actual, expected, rtol=self.rtol, atol=self.atol))
+        return {
+            "correct": correct,
+            "method": "values",
+            "message": "Correct!" if correct else "Not quite, try again.",
+        }
+
+    def check(self, problem, submission):
+        """
+        Checks a submission against problem["raw_answer"], or a Problem's serialized answer
+        (srepr strings are parsed once and their sample values cached).
+        Returns {"correct": bool, "method": "numeric" | "exact" | "values" | "invalid", "message": str}.
+        """
+        raw_answer = problem.serialized_answer if isinstance(problem, Problem) else problem.get("raw_answer")
+        if raw_answer is None:
+            return {"correct": False, "method": "invalid", "message": "This problem has no answer to check."}
+        if isinstance(raw_answer, (list, tuple)):
+            return self._check_values(raw_answer, submission)
+        try:
+            expr = self.parse(submission)
+        except ValueError as e:
+            return {"correct": False, "method": "invalid", "message": str(e)}
+
+        expected = self._reference(raw_answer)
+        try:
+            with np.errstate(all="ignore"):
+                actual = self._evaluate(expr)
+                valid = np.isfinite(expected) & np.isfinite(actual)
+
+            if valid.sum() >= self.min_valid:
+                correct = bool(np.allclose(actual[valid], expected[valid], rtol=self.rtol, atol=self.atol))
+                method = "numeric"
+            else:
+                # Too few points in the shared domain; compare symbolically instead
+                correct = bool(sp.simplify(expr - sp.sympify(raw_answer)) == 0)
+                method = "exact"
+        except Exception as e:
+            # Parsed but cannot be evaluated (e.g. zoo*x, unevaluated integrals)
+            return {"correct": False, "method": "invalid", "message": f"Could not evaluate answer: {e}"}
+
+        return {
+            "correct": correct,
+            "method": method,
+            "message": "Correct!" if correct else "Not quite, try again.",
+        }
@@ -1,40 +1,48 @@
-import sympy as sp
 import random
 
+from src.core.modules.math_foundations.templates import get_templates, symbols
+from src.core.plugins import get_registry
+from src.utils.metrics import timed
+
 class MathGenerator:
-    def __init__(self):
-        self.x = sp.symbols('x')
+    def __init__(self, seed=None):
+        """
+        seed: Seed for this generator's private random stream.
+        Any value accepted by random.Random; None seeds from system entropy.
+        """
+        self.rng = random.Random(seed)
+
+    @property
+    def x(self):
+        return symbols()[0]
+
+    @staticmethod
+    def categories():
+        """Problem categories of every registered generator plugin (see src/core/plugins.py)."""
+        return get_registry().categories()
 
     def generate_calculus_derivative(self):
-        """Generates a random function and its derivative."""
+        """Generates a random function and its derivative from a pre-differentiated template."""
         # Random coefficients and powers
-        a, b, c = random.randint(1, 10), random.randint(1, 10), random.randint(1, 5)
-        n, m = random.randint(2, 5), random.randint(2, 5)
-        
-        # Mix of polynomials and trig
-        functions = [
-            a * self.x**n + b * self.x,
-            a * sp.sin(b * self.x),
-            a * sp.cos(b * self.x),
-            a * self.x**2 + b * sp.exp(self.x),
-            a * sp.log(self.x**2 + 1)
-        ]
+        a, b, c = self.rng.randint(1, 10), self.rng.randint(1, 10), self.rng.randint(1, 5)
+        n, m = self.rng.randint(2, 5), self.rng.randint(2, 5)
         
-        func = random.choice(functions)
-        derivative = sp.diff(func, self.x)
+        # Mix of polynomials and trig (see templates.py to register more families)
+        template = self.rng.choice(get_templates())
+        func_tex, derivative_tex, derivative = template.render(a, b, n)
         
         return {
             "type": "derivative",
-            "question": f"Find the derivative of: $f(x) = {sp.latex(func)}$",
-            "answer": f"$f'(x) = {sp.latex(derivative)}$",
+            "question": f"Find the derivative of: $f(x) = {func_tex}$",
+            "answer": f"$f'(x) = {derivative_tex}$",
             "raw_answer": derivative
         }
 
-    def generate_linear_algebra_dot(self):
-        """Generates a dot product problem."""
-        dim = random.randint(2, 3)
-        v1 = [random.randint(-5, 5) for _ in range(dim)]
-        v2 = [random.randint(-5, 5) for _ in range(dim)]
+    def generate_linear_algebra_dot(self, difficulty=None):
+        """Generates a dot product problem. difficulty: 1 (2D) or 2 (3D); random if None."""
+        dim = self.rng.randint(2, 3) if difficulty is None else difficulty + 1
+        v1 = [self.rng.randint(-5, 5) for _ in range(dim)]
+        v2 = [self.rng.randint(-5, 5) for _ in range(dim)]
         
         dot_product = sum(i*j for i, j in zip(v1, v2))
         
@@ -46,16 +54,20 @@ class MathGenerator:
             "type": "linalg_dot",
             "question": f"Calculate the dot product: ${vec1_tex} \\cdot {vec2_tex}$",
             "answer": f"${dot_product}$",
-            "raw_answer": dot_product
+            "raw_answer": dot_product,
+            "difficulty": dim - 1
         }
 
-    def get_problem(self, category):
-        if category == "Calculus (Derivatives)":
-            return self.generate_calculus_derivative()
-        elif category == "Linear Algebra (Dot Product)":
-            return self.generate_linear_algebra_dot()
-        else:
+    @timed("generator.get_problem")
+    def get_problem(self, category, difficulty=None):
+        """difficulty: Level from 1 to get_registry().levels(category); ignored by single-level categories."""
+        registry = get_registry()
+        generate = registry.generator(category)
+        if generate is None:
             return {"question": "Select a valid category.", "answer": ""}
+        if difficulty is None or registry.levels(category) == 1:
+            return generate(self)
+        return generate(self, difficulty=difficulty)
 
 if __name__ == "__main__":
     gen = MathGenerator()
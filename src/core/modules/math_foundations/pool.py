@@ -0,0 +1,97 @@
+import threading
+from collections import deque
+
+from src.core.modules.math_foundations.generator import MathGenerator
+from src.core.modules.math_foundations.problem import Problem
+from src.core.logger import Logger
+from src.core.plugins import get_registry
+
+logger = Logger().get_logger()
+
+RETRY_DELAY = 1.0 # Seconds before the worker retries a category whose generation failed
+
+
+class ProblemPool:
+    """
+    Per-category buffers of ready-made problems, refilled by a background thread.
+
+    get_problem() pops from the buffer in constant time. When a buffer drops
+    below low_watermark the worker tops it back up to high_watermark; if a
+    buffer is empty the problem is generated inline instead. Problems are
+    handed out as compact Problem records (serialized answer, no sympy tree),
+    converted by the worker for buffered ones.
+    """
+
+    def __init__(self, generator=None, categories=None, low_watermark=4, high_watermark=16):
+        if not 0 <= low_watermark < high_watermark:
+            raise ValueError("Expected 0 <= low_watermark < high_watermark")
+        self.generator = generator or MathGenerator()
+        self.categories = tuple(categories or self.generator.categories())
+        self.low_watermark = low_watermark
+        self.high_watermark = high_watermark
+        self.buffers = {category: deque() for category in self.categories}
+        self.hits = 0
+        self.misses = 0
+
+        self._wakeup = threading.Condition()
+        self._stopped = False
+        self._worker = threading.Thread(target=self._refill_loop, name="ProblemPool", daemon=True)
+        self._worker.start()
+
+    def get_problem(self, category, difficulty=None):
+        """
+        Buffers hold problems of random difficulty, so a specific difficulty is
+        generated inline (except for single-level categories, which have only one).
+        """
+        buffer = self.buffers.get(category)
+        if difficulty is not None and get_registry().levels(category) == 1:
+            difficulty = None
+        if buffer is None or difficulty is not None:
+            return self._generate(category, difficulty)
+        try:
+            problem = buffer.popleft()
+            self.hits += 1
+        except IndexError:
+            problem = self._generate(category)
+            self.misses += 1
+        if len(buffer) < self.low_watermark:
+            with self._wakeup:
+                self._wakeup.notify()
+        return problem
+
+    def _generate(self, category, difficulty=None):
+        return Problem.from_dict(self.generator.get_problem(category, difficulty))
+
+    def levels(self):
+        return {category: len(buffer) for category, buffer in self.buffers.items()}
+
+    def stop(self, timeout=None):
+        with self._wakeup:
+            self._stopped = True
+            self._wakeup.notify()
+        self._worker.join(timeout)
+
+    def _needs_refill(self):
+        return any(len(buffer) < self.low_watermark for buffer in self.buffers.values())
+
+    def _refill_loop(self):
+        # Fill every buffer up to the high watermark, then sleep until one drains
+        while True:
+            failed = False
+            for category, buffer in self.buffers.items():
+                while len(buffer) < self.high_watermark and not self._stopped:
+                    try:
+                        buffer.append(self._generate(category))
+                    except Exception:
+                        # One bad problem must not stop the worker; the category is retried later
+                        logger.exception(f"ProblemPool failed to generate a {category} problem")
+                        failed = True
+                        break
+            with self._wakeup:
+                if failed and not self._stopped:
+                    # Buffers are still low, so waiting for a drain would spin; back off instead
+                    self._wakeup.wait(RETRY_DELAY)
+                while not failed and not self._stopped and not self._needs_refill():
+                    self._wakeup.wait()
+                if self._stopped:
+                    return
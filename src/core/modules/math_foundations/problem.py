@@ -0,0 +1,58 @@
+"""
+Compact record of a generated problem, for problems that are kept around
+(pool buffers, the dashboard's current problem in every session).
+
+Generators return dicts whose raw_answer is a live sympy expression tree: a
+few KiB of nested objects per problem. A Problem stores the answer in its
+serialized form instead (srepr string, or the plain number / list it already
+was) and rebuilds the expression only when raw_answer is read. The answer
+checker and the API work from the serialized form directly.
+"""
+from src.utils.startup import LazyModule
+
+sp = LazyModule("sympy")
+
+
+def serialize_answer(raw):
+    """JSON-ready form of a raw answer: sympy expressions become srepr strings."""
+    if raw is None or isinstance(raw, (int, float, str, list)): # Lists: matrix or eigenvalue answers
+        return raw
+    if isinstance(raw, sp.Basic):
+        return sp.srepr(raw)
+    return str(raw)
+
+
+class Problem:
+    __slots__ = ("type", "question", "answer", "serialized_answer", "difficulty")
+
+    def __init__(self, type, question, answer, serialized_answer=None, difficulty=1):
+        """
+        serialized_answer: Answer as returned by serialize_answer()
+        difficulty: Level the problem was generated at (1 for single-level categories)
+        """
+        self.type = type
+        self.question = question
+        self.answer = answer
+        self.serialized_answer = serialized_answer
+        self.difficulty = difficulty
+
+    @classmethod
+    def from_dict(cls, problem):
+        """Record of a generator's problem dict; the dict (and its expression tree) can then be dropped."""
+        return cls(problem.get("type"), problem.get("question", ""), problem.get("answer", ""),
+                   serialize_answer(problem.get("raw_answer")), problem.get("difficulty", 1))
+
+    @property
+    def raw_answer(self):
+        """The answer as generated (a sympy expression is rebuilt on every read, not kept)."""
+        if isinstance(self.serialized_answer, str):
+            return sp.sympify(self.serialized_answer)
+        return self.serialized_answer
+
+    def to_dict(self):
+        """Problem dict in the generators' format, with a rebuilt raw_answer."""
+        return {"type": self.type, "question": self.question, "answer": self.answer,
+                "raw_answer": self.raw_answer, "difficulty": self.difficulty}
+
+    def __repr__(self):
+        return f"Problem({self.type!r}, difficulty={self.difficulty})"
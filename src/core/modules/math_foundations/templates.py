@@ -0,0 +1,127 @@
+from src.utils.startup import LazyModule
+
+# sympy is only imported once a template is first used
+sp = LazyModule("sympy")
+
+_symbols = None
+
+
+def symbols():
+    """Shared symbols (x, a, b, n): every family is a function of x with integer coefficients a, b, n."""
+    global _symbols
+    if _symbols is None:
+        _symbols = sp.symbols('x a b n')
+    return _symbols
+
+
+def _coef(c):
+    """LaTeX coefficient prefix, omitting a leading 1 the way sympy does."""
+    return "" if c == 1 else f"{c} "
+
+
+def _power(k):
+    return "x" if k == 1 else f"x^{{{k}}}"
+
+
+def latex_fields(a, b, n):
+    """Values available to LaTeX templates for coefficients (a, b, n)."""
+    return {
+        "a": a, "b": b, "n": n,
+        "a_": _coef(a), "b_": _coef(b), "an_": _coef(a * n), "ab_": _coef(a * b),
+        "two_a": 2 * a, "two_a_": _coef(2 * a),
+        "x_n": _power(n), "x_n1": _power(n - 1),
+        "bx": _coef(b) + "x",
+    }
+
+
+class DerivativeTemplate:
+    """
+    A family of functions f(x; a, b, n) differentiated once, symbolically in its coefficients.
+
+    Generating a problem is then coefficient substitution plus string formatting.
+    build: Callable (x, a, b, n) -> sympy expression, called on first use
+    question/answer: str.format templates over latex_fields(); when omitted,
+    the LaTeX is rendered by sympy for each problem (correct, but slow).
+    """
+
+    def __init__(self, name, build, question=None, answer=None):
+        self.name = name
+        self.build = build
+        self.question = question
+        self.answer = answer
+        self._expr = None
+        self._derivative = None
+        self._rendered = {} # (a, b, n) -> render() result; coefficient ranges are small
+
+    @property
+    def expr(self):
+        if self._expr is None:
+            self._expr = self.build(*symbols())
+        return self._expr
+
+    @property
+    def derivative(self):
+        # Differentiated on first use, then reused for every problem
+        if self._derivative is None:
+            self._derivative = sp.diff(self.expr, symbols()[0])
+        return self._derivative
+
+    def substitutions(self, a_val, b_val, n_val):
+        _, a, b, n = symbols()
+        return {a: sp.Integer(a_val), b: sp.Integer(b_val), n: sp.Integer(n_val)}
+
+    def render(self, a_val, b_val, n_val):
+        """Returns (function LaTeX, derivative LaTeX, derivative expression)."""
+        key = (a_val, b_val, n_val)
+        rendered = self._rendered.get(key)
+        if rendered is None:
+            rendered = self._rendered[key] = self._render(a_val, b_val, n_val)
+        return rendered
+
+    def _render(self, a_val, b_val, n_val):
+        subs = self.substitutions(a_val, b_val, n_val)
+        derivative = self.derivative.xreplace(subs)
+        if self.question is None or self.answer is None:
+            return sp.latex(self.expr.xreplace(subs)), sp.latex(derivative), derivative
+        fields = latex_fields(a_val, b_val, n_val)
+        return self.question.format(**fields), self.answer.format(**fields), derivative
+
+
+TEMPLATES = {}
+
+
+def register_template(template):
+    """Adds (or replaces) a function family used by MathGenerator.generate_calculus_derivative."""
+    TEMPLATES[template.name] = template
+    return template
+
+
+def get_templates():
+    return tuple(TEMPLATES.values())
+
+
+register_template(DerivativeTemplate(
+    "polynomial", lambda x, a, b, n: a * x**n + b * x,
+    question="{a_}{x_n} + {bx}",
+    answer="{an_}{x_n1} + {b}",
+))
+register_template(DerivativeTemplate(
+    "sine", lambda x, a, b, n: a * sp.sin(b * x),
+    question=r"{a_}\sin{{\left({bx} \right)}}",
+    answer=r"{ab_}\cos{{\left({bx} \right)}}",
+))
+register_template(DerivativeTemplate(
+    "cosine", lambda x, a, b, n: a * sp.cos(b * x),
+    question=r"{a_}\cos{{\left({bx} \right)}}",
+    answer=r"- {ab_}\sin{{\left({bx} \right)}}",
+))
+register_template(DerivativeTemplate(
+    "quadratic_exp", lambda x, a, b, n: a * x**2 + b * sp.exp(x),
+    question="{a_}x^{{2}} + {b_}e^{{x}}",
+    answer="{two_a_}x + {b_}e^{{x}}",
+))
+register_template(DerivativeTemplate(
+    "log", lambda x, a, b, n: a * sp.log(x**2 + 1),
+    question=r"{a_}\log{{\left(x^{{2}} + 1 \right)}}",
+    answer=r"\frac{{{two_a} x}}{{x^{{2}} + 1}}",
+))
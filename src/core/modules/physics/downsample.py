@@ -0,0 +1,74 @@
+"""
+Downsampling of flight telemetry for plotting.
+
+Largest-Triangle-Three-Buckets (Steinarsson, 2013) keeps, from each bucket
+of consecutive samples, the point forming the largest triangle with the
+point kept from the previous bucket and the average of the next bucket,
+which preserves the visual shape of a curve with a fraction of its points.
+"""
+import numpy as np
+
+from src.core.modules.physics.simulation import SimulationResult
+
+# Columns whose shape the plotted telemetry preserves
+PLOT_COLUMNS = ("Altitude (m)", "Velocity (m/s)")
+
+
+def lttb(x, y, n_out):
+    """
+    Indices of the n_out points of (x, y) selected by LTTB, in increasing order.
+    x must be sorted. All points are kept when there are no more than n_out.
+    """
+    n = len(x)
+    if n_out >= n or n <= 2:
+        return np.arange(n)
+    if n_out < 3:
+        raise ValueError("LTTB needs a budget of at least 3 points")
+
+    # First and last points are always kept; the rest are split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    counts = np.diff(edges)
+    # Average of every bucket at once; the last bucket's "next bucket" is the final point
+    avg_x = np.append(np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / counts, x[-1])
+    avg_y = np.append(np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / counts, y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        ax, ay = x[a], y[a]
+        nx, ny = avg_x[b + 1], avg_y[b + 1]
+        # Twice the triangle area for every candidate in the bucket
+        area = np.abs((ax - nx) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (ny - ay))
+        a = lo + int(np.argmax(area))
+        selected[b + 1] = a
+    return selected
+
+
+def key_indices(result):
+    """Samples a plot must never drop: launch, burnout, apogee, top speed and touchdown."""
+    keys = [0, len(result) - 1, int(np.argmax(result["Altitude (m)"])), int(np.argmax(result["Velocity (m/s)"]))]
+    powered = np.flatnonzero(result["Thrust (N)"] > 0)
+    if powered.size:
+        # Last sample under thrust and the first one after it
+        keys += [int(powered[-1]), min(int(powered[-1]) + 1, len(result) - 1)]
+    return keys
+
+
+def downsample(result, max_points=1000, columns=PLOT_COLUMNS):
+    """
+    SimulationResult with at most max_points rows, chosen by LTTB on each of
+    `columns` (against time) plus key_indices(). Returns result unchanged if
+    it is already within the budget.
+    """
+    n = len(result)
+    if n <= max_points:
+        return result
+    keys = key_indices(result)
+    per_column = max(3, (max_points - len(keys)) // len(columns))
+    time = result["Time (s)"]
+    chosen = [np.asarray(keys)] + [lttb(time, result[col], per_column) for col in columns]
+    index = np.unique(np.concatenate(chosen))
+    return SimulationResult({name: col[index] for name, col in result.columns.items()},
+                            steps=result.steps, events=result.events)
@@ -0,0 +1,92 @@
+import numpy as np
+
+# Dormand-Prince 5(4) tableau
+DP_C = (0.0, 1/5, 3/10, 4/5, 8/9, 1.0, 1.0)
+DP_A = (
+    (),
+    (1/5,),
+    (3/40, 9/40),
+    (44/45, -56/15, 32/9),
+    (19372/6561, -25360/2187, 64448/6561, -212/729),
+    (9017/3168, -355/33, 46732/5247, 49/176, -5103/18656),
+    (35/384, 0.0, 500/1113, 125/192, -2187/6784, 11/84),
+)
+DP_B = np.array([35/384, 0.0, 500/1113, 125/192, -2187/6784, 11/84, 0.0])
+DP_B_STAR = np.array([5179/57600, 0.0, 7571/16695, 393/640, -92097/339200, 187/2100, 1/40])
+DP_E = DP_B - DP_B_STAR
+
+
+def rk4_step(f, t, y, h, k1=None):
+    """Classic fourth-order Runge-Kutta step. Returns the new state."""
+    if k1 is None:
+        k1 = f(t, y)
+    k2 = f(t + h / 2, y + h / 2 * k1)
+    k3 = f(t + h / 2, y + h / 2 * k2)
+    k4 = f(t + h, y + h * k3)
+    return y + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+
+
+def dopri5_step(f, t, y, h, k1=None):
+    """
+    Dormand-Prince 5(4) step.
+    Returns (y_new, f(t + h, y_new), error_estimate). The second value is the
+    first stage of the next step (FSAL), so callers can pass it back as k1.
+    """
+    if k1 is None:
+        k1 = f(t, y)
+    k = [k1]
+    for i in range(1, 7):
+        dy = sum(a * ki for a, ki in zip(DP_A[i], k))
+        k.append(f(t + DP_C[i] * h, y + h * dy))
+    # The 7th stage is evaluated at the 5th-order solution
+    y_new = y + h * sum(b * ki for b, ki in zip(DP_B[:6], k[:6]))
+    error = h * sum(e * ki for e, ki in zip(DP_E, k))
+    return y_new, k[6], error
+
+
+def error_norm(error, y0, y1, rtol, atol):
+    """RMS norm of the local error scaled by the mixed tolerance."""
+    scale = atol + rtol * np.maximum(np.abs(y0), np.abs(y1))
+    return float(np.sqrt(np.mean((error / scale) ** 2)))
+
+
+def hermite(t0, t1, y0, y1, dy0, dy1, t):
+    """Cubic Hermite interpolant on [t0, t1] matching values and slopes at both ends."""
+    h = t1 - t0
+    s = (t - t0) / h
+    s2 = s * s
+    s3 = s2 * s
+    return ((2 * s3 - 3 * s2 + 1) * y0 + (s3 - 2 * s2 + s) * h * dy0
+            + (-2 * s3 + 3 * s2) * y1 + (s3 - s2) * h * dy1)
+
+
+def find_root(g, a, b, ga=None, gb=None, tol=1e-12, max_iter=100):
+    """
+    Root of g on [a, b] where g(a) and g(b) bracket zero.
+    Uses the Illinois variant of regula falsi, which keeps the bracket and
+    converges superlinearly on smooth functions such as the Hermite interpolant.
+    """
+    ga = g(a) if ga is None else ga
+    gb = g(b) if gb is None else gb
+    if ga == 0:
+        return a
+    if gb == 0:
+        return b
+    side = 0
+    c = a
+    for _ in range(max_iter):
+        c = (a * gb - b * ga) / (gb - ga)
+        gc = g(c)
+        if gc == 0 or abs(b - a) < tol * max(1.0, abs(c)):
+            break
+        if (gc > 0) == (gb > 0):
+            b, gb = c, gc
+            if side == -1:
+                ga /= 2
+            side = -1
+        else:
+            a, ga = c, gc
+            if side == 1:
+                gb /= 2
+            side = 1
+    return c
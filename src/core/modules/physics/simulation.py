@@ -1,40 +1,147 @@
 import numpy as np
 import pandas as pd
 
+from src.core.modules.physics.integrators import dopri5_step, error_norm, find_root, hermite, rk4_step
+from src.utils import metrics
+
+METHODS = ("euler", "rk4", "rk45")
+COLUMNS = ("Time (s)", "Altitude (m)", "Velocity (m/s)", "Acceleration (m/s^2)", "Thrust (N)", "Mass (kg)")
+
+class SimulationResult:
+    """
+    Columnar flight telemetry.
+    Each column is a NumPy array keyed by its display name, so
+    results["Altitude (m)"].max() works without building a DataFrame.
+    """
+
+    def __init__(self, columns, steps=0, events=None):
+        self.columns = columns
+        self.steps = steps # Integration steps taken (>= rows when decimated)
+        self.events = events or {} # Root-found event times (rk4/rk45 only)
+
+    def __getitem__(self, key):
+        return self.columns[key]
+
+    def __contains__(self, key):
+        return key in self.columns
+
+    def __len__(self):
+        return len(next(iter(self.columns.values()), ()))
+
+    def keys(self):
+        return self.columns.keys()
+
+    @property
+    def nbytes(self):
+        return sum(col.nbytes for col in self.columns.values())
+
+    def to_dataframe(self):
+        return pd.DataFrame(self.columns)
+
+    def freeze(self):
+        """Marks every column read-only so the result can be shared (e.g. from a cache)."""
+        for col in self.columns.values():
+            col.setflags(write=False)
+        return self
+
+
+class _TelemetryBuffer:
+    """Growable column buffers for integrators whose step count is not known up front."""
+
+    def __init__(self, capacity=256):
+        self.data = np.empty((len(COLUMNS), capacity))
+        self.n = 0
+
+    def append(self, *row):
+        if self.n == self.data.shape[1]:
+            self.data = np.concatenate([self.data, np.empty_like(self.data)], axis=1)
+        self.data[:, self.n] = row
+        self.n += 1
+
+    def columns(self):
+        return {name: self.data[i, :self.n].copy() for i, name in enumerate(COLUMNS)}
+
+
 class RocketSimulator:
-    def __init__(self, dry_mass=100.0, fuel_mass=50.0, thrust=5000.0, burn_time=10.0, dt=0.1):
+    def __init__(self, dry_mass=100.0, fuel_mass=50.0, thrust=5000.0, burn_time=10.0, dt=0.1, record_every=1,
+                 method="euler", rtol=1e-6, atol=1e-6):
         """
         Initialize rocket parameters.
         dry_mass: Mass of the rocket without fuel (kg)
         fuel_mass: Mass of the fuel (kg)
         thrust: Engine thrust (N)
         burn_time: Time until fuel is exhausted (s)
-        dt: Time step for simulation (s)
+        dt: Time step for simulation (s); initial step guess for rk45
+        record_every: Keep every k-th step in the telemetry (touchdown is always kept)
+        method: "euler" (fixed step), "rk4" (fixed step) or "rk45" (adaptive Dormand-Prince)
+        rtol, atol: Local error tolerances for rk45
         """
+        if record_every < 1:
+            raise ValueError("record_every must be >= 1")
+        if method not in METHODS:
+            raise ValueError(f"Unknown integration method: {method}. Choose from {METHODS}")
         self.dry_mass = dry_mass
         self.fuel_mass = fuel_mass
         self.thrust = thrust
         self.burn_time = burn_time
         self.dt = dt
+        self.record_every = int(record_every)
+        self.method = method
+        self.rtol = rtol
+        self.atol = atol
+        self.max_time = 300.0 # Simulation time limit (s)
         self.g = 9.81  # Gravity (m/s^2)
         self.drag_coefficient = 0.5 # Simplified drag
         self.air_density = 1.225 # Sea level (kg/m^3)
         self.cross_section_area = 0.1 # m^2
 
+    def cache_key(self):
+        """Hashable key covering every input that affects run()."""
+        return (
+            float(self.dry_mass), float(self.fuel_mass), float(self.thrust), float(self.burn_time),
+            self.method, float(self.dt), self.record_every, float(self.rtol), float(self.atol), self.max_time
+        )
+
     def run(self):
+        """
+        Runs the simulation with the configured integration method.
+        Returns a SimulationResult (call .to_dataframe() for a DataFrame).
+        """
+        with metrics.timer("simulation.run"):
+            result = self._run_euler() if self.method == "euler" else self._run_runge_kutta()
+        metrics.observe("simulation.steps", result.steps)
+        return result
+
+    def _run_euler(self):
         """
         Runs the simulation using Euler integration.
-        Returns a DataFrame with time-series data.
+        Telemetry is written into preallocated column arrays sized from the
+        time limit and dt, then trimmed at touchdown.
+        Returns a SimulationResult (call .to_dataframe() for a DataFrame).
         """
         t = 0.0
         h = 0.0 # Height
         v = 0.0 # Velocity
         current_fuel = self.fuel_mass
-        
-        results = []
-        
+        dt = self.dt
+        k = self.record_every
+
+        # Upper bound on steps (with slack for floating-point drift in t)
+        max_steps = int(np.ceil(self.max_time / dt)) + 1
+        rows = -(-max_steps // k) + 1
+        time_col = np.empty(rows)
+        alt_col = np.empty(rows)
+        vel_col = np.empty(rows)
+        acc_col = np.empty(rows)
+        thrust_col = np.empty(rows)
+        mass_col = np.empty(rows)
+
+        step = 0
+        n = 0
+        recorded = False
+
         # Simulate until it hits the ground (h < 0) or a max time limit
-        while (h >= 0 or t == 0) and t < 300:
+        while (h >= 0 or t == 0) and t < self.max_time:
             # 1. Determine Mass
             total_mass = self.dry_mass + current_fuel
             
@@ -44,7 +151,7 @@ class RocketSimulator:
                 F_thrust = self.thrust
                 # Burn fuel linearly
                 fuel_rate = self.fuel_mass / self.burn_time
-                current_fuel -= fuel_rate * self.dt
+                current_fuel -= fuel_rate * dt
                 if current_fuel < 0: current_fuel = 0
             else:
                 F_thrust = 0.0
@@ -65,22 +172,269 @@ class RocketSimulator:
             a = F_net / total_mass
             
             # Update State (Euler Integration)
-            v += a * self.dt
-            h += v * self.dt
-            t += self.dt
-            
-            results.append({
-                "Time (s)": t,
-                "Altitude (m)": h,
-                "Velocity (m/s)": v,
-                "Acceleration (m/s^2)": a,
-                "Thrust (N)": F_thrust,
-                "Mass (kg)": total_mass
-            })
+            v += a * dt
+            h += v * dt
+            t += dt
+
+            # Record every k-th step
+            recorded = step % k == 0
+            if recorded:
+                time_col[n] = t
+                alt_col[n] = h
+                vel_col[n] = v
+                acc_col[n] = a
+                thrust_col[n] = F_thrust
+                mass_col[n] = total_mass
+                n += 1
+            step += 1
             
             # Stop if we hit the ground with negative velocity (falling)
             if h < 0 and v < 0:
-                h = 0
                 break
-                
-        return pd.DataFrame(results)
+
+        # Always keep the final (touchdown) sample
+        if step and not recorded:
+            time_col[n] = t
+            alt_col[n] = h
+            vel_col[n] = v
+            acc_col[n] = a
+            thrust_col[n] = F_thrust
+            mass_col[n] = total_mass
+            n += 1
+
+        return SimulationResult({
+            "Time (s)": time_col[:n].copy(),
+            "Altitude (m)": alt_col[:n].copy(),
+            "Velocity (m/s)": vel_col[:n].copy(),
+            "Acceleration (m/s^2)": acc_col[:n].copy(),
+            "Thrust (N)": thrust_col[:n].copy(),
+            "Mass (kg)": mass_col[:n].copy()
+        }, steps=step)
+
+
+    def _thrust_and_mass(self, t, powered):
+        """Thrust and mass at time t. Fuel burns linearly until burnout."""
+        if powered:
+            return self.thrust, self.dry_mass + self.fuel_mass * max(0.0, 1 - t / self.burn_time)
+        return 0.0, self.dry_mass
+
+    def _derivatives(self, t, y, powered):
+        """Right-hand side of the flight ODE for state y = [altitude, velocity]."""
+        v = y[1]
+        F_thrust, total_mass = self._thrust_and_mass(t, powered)
+        F_drag = 0.5 * self.air_density * v * abs(v) * self.drag_coefficient * self.cross_section_area
+        return np.array([v, (F_thrust - total_mass * self.g - F_drag) / total_mass])
+
+    def _run_runge_kutta(self):
+        """
+        Runs the simulation with RK4 (fixed dt) or adaptive RK45.
+        Burnout is a step boundary, so thrust never switches off mid-step.
+        Apogee and ground contact are root-found on the cubic Hermite
+        interpolant of each step, giving exact event times.
+        """
+        adaptive = self.method == "rk45"
+        powered = self.burn_time > 0 and self.fuel_mass > 0
+        f = lambda t, y: self._derivatives(t, y, powered)
+
+        t = 0.0
+        y = np.zeros(2)
+        dy = f(t, y)
+        step_size = self.dt
+        steps = 0
+        events = {}
+
+        buffer = _TelemetryBuffer()
+        buffer.append(t, y[0], y[1], dy[1], *self._thrust_and_mass(t, powered))
+
+        while t < self.max_time:
+            h_step = min(step_size, self.max_time - t)
+            if powered:
+                h_step = min(h_step, self.burn_time - t)
+
+            if adaptive:
+                y_new, dy_new, error = dopri5_step(f, t, y, h_step, dy)
+                norm = error_norm(error, y, y_new, self.rtol, self.atol)
+                factor = min(5.0, max(0.2, 0.9 * norm ** -0.2)) if norm > 0 else 5.0
+                step_size = h_step * factor
+                if norm > 1:
+                    continue # Rejected, retry with a smaller step
+            else:
+                y_new = rk4_step(f, t, y, h_step, dy)
+                dy_new = f(t + h_step, y_new)
+
+            t_new = t + h_step
+            steps += 1
+
+            # Apogee: velocity crosses zero from above
+            if y[1] > 0 >= y_new[1]:
+                g = lambda s: hermite(t, t_new, y[1], y_new[1], dy[1], dy_new[1], s)
+                t_event = find_root(g, t, t_new, y[1], y_new[1])
+                h_event = hermite(t, t_new, y[0], y_new[0], dy[0], dy_new[0], t_event)
+                events["apogee"] = float(t_event)
+                buffer.append(t_event, h_event, 0.0, *self._event_row(t_event, h_event, 0.0, powered))
+
+            # Ground contact: altitude crosses zero from above
+            if y_new[0] < 0 <= y[0]:
+                g = lambda s: hermite(t, t_new, y[0], y_new[0], dy[0], dy_new[0], s)
+                t_event = find_root(g, t, t_new, y[0], y_new[0])
+                v_event = hermite(t, t_new, y[1], y_new[1], dy[1], dy_new[1], t_event)
+                events["touchdown"] = float(t_event)
+                buffer.append(t_event, 0.0, v_event, *self._event_row(t_event, 0.0, v_event, powered))
+                break
+
+            if steps % self.record_every == 0:
+                buffer.append(t_new, y_new[0], y_new[1], dy_new[1], *self._thrust_and_mass(t_new, powered))
+
+            if powered and t_new >= self.burn_time:
+                t_new = self.burn_time
+                events["burnout"] = float(t_new)
+                powered = False
+                dy_new = f(t_new, y_new)
+
+            t, y, dy = t_new, y_new, dy_new
+        else:
+            # Time limit reached in the air; keep the final sample
+            if steps % self.record_every:
+                buffer.append(t, y[0], y[1], dy[1], *self._thrust_and_mass(t, powered))
+
+        return SimulationResult(buffer.columns(), steps=steps, events=events)
+
+    def _event_row(self, t, h, v, powered):
+        """Acceleration, thrust and mass at an interpolated event point."""
+        a = self._derivatives(t, (h, v), powered)[1]
+        return (a,) + self._thrust_and_mass(t, powered)
+
+
+class BatchRocketSimulator:
+    def __init__(self, dry_mass=100.0, fuel_mass=50.0, thrust=5000.0, burn_time=10.0, dt=0.1):
+        """
+        Initialize a batch of rockets for parameter sweeps.
+        dry_mass, fuel_mass, thrust, burn_time: Scalars or arrays, broadcast against each other.
+        Each resulting element is one rocket, simulated with the same model as RocketSimulator.
+        dt: Time step shared by every rocket (s)
+        """
+        dry_mass, fuel_mass, thrust, burn_time = np.broadcast_arrays(
+            np.asarray(dry_mass, dtype=float),
+            np.asarray(fuel_mass, dtype=float),
+            np.asarray(thrust, dtype=float),
+            np.asarray(burn_time, dtype=float),
+        )
+        self.dry_mass = dry_mass.ravel()
+        self.fuel_mass = fuel_mass.ravel()
+        self.thrust = thrust.ravel()
+        self.burn_time = burn_time.ravel()
+        self.dt = dt
+        self.g = 9.81
+        self.drag_coefficient = 0.5
+        self.air_density = 1.225
+        self.cross_section_area = 0.1
+        self.max_time = 300.0
+
+    @classmethod
+    def from_grid(cls, dry_mass, fuel_mass, thrust, burn_time, dt=0.1):
+        """Builds a batch covering every combination of the given parameter values."""
+        grids = np.meshgrid(
+            np.atleast_1d(dry_mass), np.atleast_1d(fuel_mass),
+            np.atleast_1d(thrust), np.atleast_1d(burn_time), indexing="ij"
+        )
+        return cls(*grids, dt=dt)
+
+    def __len__(self):
+        return self.dry_mass.size
+
+    def run(self, trajectories=False):
+        """
+        Runs every rocket in lockstep using vectorized Euler integration.
+        Rockets that have landed are dropped from the working arrays, so the
+        cost of each step shrinks as the sweep progresses.
+        Returns a DataFrame with one row per rocket (parameters, apogee, top speed, flight time).
+        With trajectories=True, also returns a dict of (steps x rockets) arrays, NaN after touchdown.
+        Full trajectories are memory heavy; only request them for modest batch sizes.
+        """
+        n = len(self)
+        dt = self.dt
+        drag_factor = 0.5 * self.air_density * self.drag_coefficient * self.cross_section_area
+
+        apogee = np.empty(n)
+        top_speed = np.empty(n)
+        flight_time = np.empty(n)
+
+        # Working arrays only hold rockets that are still flying
+        active = np.arange(n)
+        dry_mass = self.dry_mass.copy()
+        thrust = self.thrust.copy()
+        burn_time = self.burn_time.copy()
+        # burn_time = 0 never burns (t < burn_time is false), as in the scalar simulator
+        fuel_rate = np.divide(self.fuel_mass, self.burn_time, out=np.zeros_like(self.fuel_mass),
+                              where=self.burn_time > 0)
+        fuel = self.fuel_mass.copy()
+        h = np.zeros(n)
+        v = np.zeros(n)
+        max_h = np.full(n, -np.inf)
+        max_v = np.full(n, -np.inf)
+
+        history = {key: [] for key in ("Altitude (m)", "Velocity (m/s)", "Acceleration (m/s^2)", "Thrust (N)", "Mass (kg)")}
+        times = []
+
+        t = 0.0
+        while active.size and t < self.max_time:
+            total_mass = dry_mass + fuel
+
+            burning = (t < burn_time) & (fuel > 0)
+            F_thrust = np.where(burning, thrust, 0.0)
+            fuel = np.where(burning, np.maximum(fuel - fuel_rate * dt, 0.0), fuel)
+
+            F_gravity = total_mass * self.g
+            F_drag = drag_factor * v * v * np.where(v > 0, 1.0, -1.0)
+            a = (F_thrust - F_gravity - F_drag) / total_mass
+
+            v = v + a * dt
+            h = h + v * dt
+            t += dt
+
+            np.maximum(max_h, h, out=max_h)
+            np.maximum(max_v, v, out=max_v)
+
+            if trajectories:
+                times.append(t)
+                for key, values in zip(history, (h, v, a, F_thrust, total_mass)):
+                    row = np.full(n, np.nan)
+                    row[active] = values
+                    history[key].append(row)
+
+            landed = h < 0
+            if landed.any():
+                done = active[landed]
+                apogee[done] = max_h[landed]
+                top_speed[done] = max_v[landed]
+                flight_time[done] = t
+
+                keep = ~landed
+                active = active[keep]
+                dry_mass, thrust, burn_time, fuel_rate, fuel = (
+                    dry_mass[keep], thrust[keep], burn_time[keep], fuel_rate[keep], fuel[keep]
+                )
+                h, v, max_h, max_v = h[keep], v[keep], max_h[keep], max_v[keep]
+
+        # Rockets still airborne at the time limit
+        apogee[active] = max_h
+        top_speed[active] = max_v
+        flight_time[active] = t
+
+        summary = pd.DataFrame({
+            "Dry Mass (kg)": self.dry_mass,
+            "Fuel Mass (kg)": self.fuel_mass,
+            "Thrust (N)": self.thrust,
+            "Burn Time (s)": self.burn_time,
+            "Apogee (m)": apogee,
+            "Top Speed (m/s)": top_speed,
+            "Flight Time (s)": flight_time,
+        })
+
+        if not trajectories:
+            return summary
+
+        paths = {"Time (s)": np.array(times)}
+        for key, rows in history.items():
+            paths[key] = np.vstack(rows) if rows else np.empty((0, n))
+        return summary, paths
@@ -0,0 +1,203 @@
+import gzip
+import io
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+
+from PIL import Image, ImageDraw
+
+from src.core.logger import Logger
+
+logger = Logger().get_logger()
+
+THUMBNAIL_SIZE = (160, 120)
+CURVE_SEGMENTS = 8 # Line segments per quadratic curve when rasterizing
+
+
+class NoteStore:
+    """
+    Scratchpad notes stored as compressed canvas stroke JSON plus a small thumbnail.
+
+    Layout of notes_dir:
+        index.json              metadata for every note, newest last
+        <id>.json.gz            fabric.js objects from st_canvas(...).json_data
+        <id>_thumb.png          pre-rendered thumbnail
+    The gallery reads only the index and thumbnails; full-resolution images are
+    rasterized from the strokes when a note is opened or exported.
+    Notes saved as full PNGs by earlier versions are indexed once and kept as-is.
+    """
+
+    def __init__(self, notes_dir):
+        self.notes_dir = notes_dir
+        self.index_path = os.path.join(notes_dir, "index.json")
+        self._lock = threading.Lock()
+        self._index = None
+        self._index_mtime = None
+
+    # --- Index ---
+
+    def _load_index(self):
+        if not os.path.exists(self.index_path):
+            self._index = self._index_legacy_pngs()
+            if self._index:
+                self._write_index()
+            return
+        mtime = os.path.getmtime(self.index_path)
+        if self._index is None or mtime != self._index_mtime:
+            with open(self.index_path, encoding="utf-8") as f:
+                self._index = json.load(f)
+            self._index_mtime = mtime
+
+    def _write_index(self):
+        os.makedirs(self.notes_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.notes_dir, suffix=".json.tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self.index_path)
+        self._index_mtime = os.path.getmtime(self.index_path)
+
+    def _index_legacy_pngs(self):
+        """One-time scan for PNG notes written before the index existed."""
+        if not os.path.isdir(self.notes_dir):
+            return []
+        entries = []
+        for filename in sorted(os.listdir(self.notes_dir)):
+            if not filename.endswith(".png") or filename.endswith("_thumb.png"):
+                continue
+            note_id = filename[:-4]
+            try:
+                with Image.open(os.path.join(self.notes_dir, filename)) as im:
+                    width, height = im.size
+                    thumb = im.convert("RGBA")
+                    thumb.thumbnail(THUMBNAIL_SIZE)
+                    thumb.save(self._thumb_path(note_id), "PNG")
+            except OSError as e:
+                logger.error(f"Skipping unreadable note {filename}: {e}")
+                continue
+            entries.append({"id": note_id, "format": "png", "file": filename,
+                            "created": note_id.replace("note_", ""), "width": width, "height": height})
+        if entries:
+            logger.info(f"Indexed {len(entries)} legacy PNG notes.")
+        return entries
+
+    def count(self):
+        with self._lock:
+            self._load_index()
+            return len(self._index)
+
+    def page(self, page, per_page=12):
+        """Metadata for one page of notes, newest first (page numbers start at 0)."""
+        with self._lock:
+            self._load_index()
+            end = len(self._index) - page * per_page
+            start = max(0, end - per_page)
+            return list(reversed(self._index[start:max(end, 0)]))
+
+    def get(self, note_id):
+        with self._lock:
+            self._load_index()
+            for entry in self._index:
+                if entry["id"] == note_id:
+                    return entry
+        raise KeyError(note_id)
+
+    # --- Files ---
+
+    def _thumb_path(self, note_id):
+        return os.path.join(self.notes_dir, f"{note_id}_thumb.png")
+
+    def _strokes_path(self, note_id):
+        return os.path.join(self.notes_dir, f"{note_id}.json.gz")
+
+    def thumbnail_path(self, note_id):
+        return self._thumb_path(note_id)
+
+    def save(self, json_data, width, height, background="#ffffff"):
+        """Stores a canvas drawing. Returns the new note id."""
+        objects = (json_data or {}).get("objects", [])
+        if not objects:
+            raise ValueError("Nothing to save: the canvas is empty.")
+        os.makedirs(self.notes_dir, exist_ok=True)
+        with self._lock:
+            self._load_index()
+            note_id = "note_" + datetime.now().strftime("%Y%m%d_%H%M%S")
+            existing = {entry["id"] for entry in self._index}
+            suffix = 1
+            while note_id in existing:
+                note_id = f"{note_id.split('-')[0]}-{suffix}"
+                suffix += 1
+
+            drawing = {"width": width, "height": height, "background": background, "objects": objects}
+            with gzip.open(self._strokes_path(note_id), "wt", encoding="utf-8") as f:
+                json.dump(drawing, f, separators=(",", ":"))
+            rasterize(drawing, scale=min(THUMBNAIL_SIZE[0] / width, THUMBNAIL_SIZE[1] / height)).save(
+                self._thumb_path(note_id), "PNG"
+            )
+
+            self._index.append({"id": note_id, "format": "strokes", "created": note_id.replace("note_", ""),
+                                "width": width, "height": height, "strokes": len(objects)})
+            self._write_index()
+        logger.info(f"Saved note: {note_id}")
+        return note_id
+
+    def render(self, note_id):
+        """Full-resolution image of a note."""
+        entry = self.get(note_id)
+        if entry["format"] == "png":
+            with Image.open(os.path.join(self.notes_dir, entry["file"])) as im:
+                return im.copy()
+        with gzip.open(self._strokes_path(note_id), "rt", encoding="utf-8") as f:
+            return rasterize(json.load(f))
+
+    def export_png(self, note_id):
+        buffer = io.BytesIO()
+        self.render(note_id).save(buffer, "PNG")
+        return buffer.getvalue()
+
+
+def _path_points(path):
+    """Splits a fabric.js SVG-style path into polylines, flattening quadratic curves."""
+    polylines = []
+    current = []
+    for command in path:
+        op, args = command[0], command[1:]
+        if op == "M":
+            if len(current) > 1:
+                polylines.append(current)
+            current = [tuple(args[:2])]
+        elif op == "L" and current:
+            current.append(tuple(args[:2]))
+        elif op == "Q" and current:
+            x0, y0 = current[-1]
+            cx, cy, x1, y1 = args[:4]
+            for i in range(1, CURVE_SEGMENTS + 1):
+                t = i / CURVE_SEGMENTS
+                u = 1 - t
+                current.append((u * u * x0 + 2 * u * t * cx + t * t * x1,
+                                u * u * y0 + 2 * u * t * cy + t * t * y1))
+    if current:
+        polylines.append(current)
+    return polylines
+
+
+def rasterize(drawing, scale=1.0):
+    """Renders stored canvas strokes to an RGBA image at the given scale."""
+    size = (max(1, round(drawing["width"] * scale)), max(1, round(drawing["height"] * scale)))
+    image = Image.new("RGBA", size, drawing.get("background") or "#ffffff")
+    draw = ImageDraw.Draw(image)
+    for obj in drawing["objects"]:
+        if obj.get("type") != "path":
+            continue
+        color = obj.get("stroke") or "#000000"
+        width = max(1, round(obj.get("strokeWidth", 1) * scale))
+        for points in _path_points(obj.get("path", [])):
+            scaled = [(x * scale, y * scale) for x, y in points]
+            if len(scaled) == 1:
+                x, y = scaled[0]
+                r = width / 2
+                draw.ellipse([x - r, y - r, x + r, y + r], fill=color)
+            else:
+                draw.line(scaled, fill=color, width=width, joint="curve")
+    return image
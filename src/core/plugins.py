@@ -0,0 +1,173 @@
+"""
+Registry of lesson and problem-generator plugins.
+
+Each package under src/core/modules/ may ship a plugin.json describing what
+it provides, without any code being imported:
+
+    {
+      "name": "Math Foundations",
+      "generators": [
+        {"category": "Calculus (Derivatives)",
+         "entry": "src.core.modules.math_foundations.generator:MathGenerator.generate_calculus_derivative"}
+      ],
+      "lessons": [
+        {"subject": "Calculus", "topic": "Derivatives Intuition",
+         "entry": "src.core.content:LessonManager._calculus_derivative_lesson"},
+        {"subject": "Calculus", "topic": "Integrals Intuition"}
+      ]
+    }
+
+Generator entries are called with the MathGenerator instance (for its rng)
+and return a problem dict. An entry declaring "levels": N (default 1) also
+accepts difficulty=1..N and marks its problems with "difficulty"; lesson entries are called with the LessonManager
+and return {"title", "markdown", "figure"}. A lesson without an entry is
+listed as "Coming Soon".
+
+The merged manifest is cached in MANIFEST_CACHE and reused while no
+plugin.json has changed, so startup reads one file. Entry modules are
+imported the first time their category or lesson is requested, and
+lookups are dictionary accesses.
+"""
+import json
+import os
+import tempfile
+import threading
+
+from src.core.logger import Logger
+from src.utils.startup import timed_import
+
+logger = Logger().get_logger()
+
+MODULES_DIR = os.path.join(os.path.dirname(__file__), "modules")
+MANIFEST_NAME = "plugin.json"
+MANIFEST_CACHE = os.path.join(MODULES_DIR, ".plugin_manifest.json")
+
+
+class PluginRegistry:
+    def __init__(self, modules_dir=MODULES_DIR, cache_path=MANIFEST_CACHE):
+        self.modules_dir = modules_dir
+        self.cache_path = cache_path
+        self._resolved = {} # entry string -> callable
+        self._generators = {} # category -> entry
+        self._levels = {} # category -> difficulty levels
+        self._lessons = {} # (subject, topic) -> entry or None
+        self._subjects = {} # subject -> [topics], in manifest order
+        self._index(self._load_manifest())
+
+    # --- Manifest ---
+
+    def _fingerprint(self):
+        """(plugin, mtime, size) of every plugin.json; one stat per plugin package."""
+        fingerprint = []
+        if not os.path.isdir(self.modules_dir):
+            return fingerprint
+        for entry in sorted(os.scandir(self.modules_dir), key=lambda e: e.name):
+            if not entry.is_dir():
+                continue
+            try:
+                st = os.stat(os.path.join(entry.path, MANIFEST_NAME))
+            except FileNotFoundError:
+                continue
+            fingerprint.append([entry.name, st.st_mtime_ns, st.st_size])
+        return fingerprint
+
+    def _load_manifest(self):
+        fingerprint = self._fingerprint()
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("fingerprint") == fingerprint:
+                return cached["plugins"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+        plugins = []
+        for name, _, _ in fingerprint:
+            path = os.path.join(self.modules_dir, name, MANIFEST_NAME)
+            try:
+                with open(path, encoding="utf-8") as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.error(f"Skipping plugin {name}: cannot read {MANIFEST_NAME}: {e}")
+                continue
+            manifest.setdefault("name", name)
+            manifest["package"] = name
+            plugins.append(manifest)
+        self._write_cache({"fingerprint": fingerprint, "plugins": plugins})
+        logger.info(f"Plugin manifest rebuilt from {len(plugins)} plugins.")
+        return plugins
+
+    def _write_cache(self, payload):
+        try:
+            directory = os.path.dirname(self.cache_path) or "."
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".json.tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            # A read-only install still works, it just rescans the plugins each start
+            logger.warning(f"Could not write plugin manifest cache: {e}")
+
+    def _index(self, plugins):
+        for plugin in plugins:
+            for gen in plugin.get("generators", []):
+                if gen["category"] in self._generators:
+                    logger.warning(f"Plugin {plugin['name']}: duplicate category {gen['category']!r} ignored.")
+                    continue
+                self._generators[gen["category"]] = gen["entry"]
+                self._levels[gen["category"]] = gen.get("levels", 1)
+            for lesson in plugin.get("lessons", []):
+                key = (lesson["subject"], lesson["topic"])
+                if key in self._lessons:
+                    logger.warning(f"Plugin {plugin['name']}: duplicate lesson {key} ignored.")
+                    continue
+                self._lessons[key] = lesson.get("entry")
+                self._subjects.setdefault(lesson["subject"], []).append(lesson["topic"])
+
+    # --- Lookup ---
+
+    def categories(self):
+        return tuple(self._generators)
+
+    def levels(self, category):
+        """Difficulty levels a category's generator accepts (1: it takes no difficulty)."""
+        return self._levels.get(category, 1)
+
+    def lessons(self):
+        """{subject: [topics]} for every registered lesson."""
+        return {subject: list(topics) for subject, topics in self._subjects.items()}
+
+    def generator(self, category):
+        """Generator callable for a category (imported on first use), or None if unknown."""
+        entry = self._generators.get(category)
+        return self._resolve(entry) if entry else None
+
+    def lesson(self, subject, topic):
+        """Lesson builder (imported on first use), or None for unknown or not yet written lessons."""
+        entry = self._lessons.get((subject, topic))
+        return self._resolve(entry) if entry else None
+
+    def _resolve(self, entry):
+        """Turns "package.module:Name.attr" into the object it names."""
+        target = self._resolved.get(entry)
+        if target is None:
+            module_name, _, qualname = entry.partition(":")
+            target = timed_import(module_name)
+            for attr in qualname.split("."):
+                target = getattr(target, attr)
+            self._resolved[entry] = target
+        return target
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """Process-wide registry, built from the manifest on first use."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = PluginRegistry()
+    return _registry
@@ -0,0 +1,136 @@
+import threading
+from collections import defaultdict
+
+from src.core.storage import diff_schedules, rebase_schedule
+
+# Share of an "In Progress" module's hours counted as done
+IN_PROGRESS_WEIGHT = 0.5
+
+
+class ProgressAggregates:
+    """
+    Running totals of planned hours and row counts per Status, Track and Week.
+
+    Built with one pass over the schedule, then kept current by applying only
+    the rows that changed, so reading the dashboard metrics does not depend on
+    the schedule size. version increases on every change, letting callers
+    rebuild charts only when the data actually moved.
+    """
+
+    def __init__(self):
+        self.hours_by_status = defaultdict(float)
+        self.count_by_status = defaultdict(int)
+        self.hours_by_track = defaultdict(float)
+        self.count_by_week = defaultdict(int)
+        self.version = 0
+
+    @classmethod
+    def from_frame(cls, df):
+        aggregates = cls()
+        aggregates._add(df, 1)
+        return aggregates
+
+    def copy(self):
+        """Independent copy, to update while readers still use the original."""
+        aggregates = type(self)()
+        for name in ("hours_by_status", "count_by_status", "hours_by_track", "count_by_week"):
+            getattr(aggregates, name).update(getattr(self, name))
+        aggregates.version = self.version
+        return aggregates
+
+    def _add(self, rows, sign):
+        if rows.empty:
+            return
+        hours = rows["Planned Hours"].fillna(0)
+        for status, total in hours.groupby(rows["Status"]).sum().items():
+            self.hours_by_status[status] += sign * float(total)
+        for status, count in rows["Status"].value_counts().items():
+            self.count_by_status[status] += sign * int(count)
+        for track, total in hours.groupby(rows["Track"]).sum().items():
+            self.hours_by_track[track] += sign * float(total)
+        for week, count in rows["Week"].value_counts().items():
+            self.count_by_week[week] += sign * int(count)
+        self._prune()
+
+    def _prune(self):
+        # Drop keys whose rows have all been removed
+        for counts, totals in ((self.count_by_status, self.hours_by_status), (self.count_by_week, None)):
+            for key in [k for k, v in counts.items() if v <= 0]:
+                del counts[key]
+                if totals is not None:
+                    totals.pop(key, None)
+        for key in [k for k, v in self.hours_by_track.items() if abs(v) < 1e-9]:
+            del self.hours_by_track[key]
+
+    def apply_changes(self, old, new):
+        """Updates the totals from old to new (both indexed by row id), touching only the rows that differ."""
+        inserted, changed, deleted = diff_schedules(old, new)
+        if not (len(inserted) or len(changed) or len(deleted)):
+            return False
+        self._add(old.loc[changed.append(deleted)], -1)
+        self._add(new.loc[changed.append(inserted)], 1)
+        self.version += 1
+        return True
+
+    @property
+    def total_hours(self):
+        return sum(self.hours_by_status.values())
+
+    @property
+    def completed_hours(self):
+        return self.hours_by_status.get("Done", 0.0)
+
+    @property
+    def in_progress_hours(self):
+        return self.hours_by_status.get("In Progress", 0.0) * IN_PROGRESS_WEIGHT
+
+    @property
+    def progress_pct(self):
+        total = self.total_hours
+        return (self.completed_hours + self.in_progress_hours) / total if total else 0.0
+
+    @property
+    def weeks(self):
+        return sorted(self.count_by_week)
+
+
+class SharedSchedule:
+    """
+    One schedule frame and its aggregates, shared by every dashboard session
+    instead of a private copy per session.
+
+    Neither is ever modified in place. commit() updates a copy of the
+    aggregates and swaps in the new (frame, aggregates) pair, so a session
+    still rendering the previous version keeps a consistent one. With pandas
+    copy-on-write, frames a session derives from df (filters, reset_index)
+    share its data and cannot write back into it; the session's pending edits
+    live in its data editor until saved. A save made from an older version
+    applies only that session's row changes to the latest one, so it does not
+    undo what other sessions saved in between.
+    """
+
+    def __init__(self, df):
+        self._lock = threading.Lock()
+        self._state = (df, ProgressAggregates.from_frame(df))
+
+    def current(self):
+        """(df, aggregates) of the latest version."""
+        return self._state
+
+    def commit(self, df, save, base=None, version=None):
+        """
+        Makes df the shared schedule and returns the stored frame.
+        save: Callable persisting df and returning the stored frame (with row ids); called
+              under the lock, so storage and the shared frame change in the same order
+        base, version: Frame df was edited from and the version of its aggregates; if
+                       another commit came in since, df is rebased onto the current frame
+        """
+        with self._lock:
+            old, aggregates = self._state
+            if base is not None and version != aggregates.version:
+                df = rebase_schedule(base, df, old)
+            saved = save(df)
+            aggregates = aggregates.copy()
+            aggregates.apply_changes(old, saved)
+            self._state = (saved, aggregates)
+            return saved
@@ -0,0 +1,302 @@
+"""
+Spaced-repetition scheduling for the Practice Arena.
+
+Every skill (problem category) has one review bucket per difficulty level the
+learner has unlocked. A bucket carries SM-2 style state: an interval that
+grows by its ease factor after each correct answer and resets after a wrong
+one, and the time it is next due. Level 1 of every skill starts unlocked;
+MASTERY_STREAK correct answers in a row at a level unlock the next one.
+
+Layout of data_dir:
+    attempts.bin     append-only log, one RECORD (16 bytes) per attempt
+    scheduler.json   snapshot of every bucket plus the log offset it covers
+
+Due times live in a min-heap, so picking the next problem is O(log n)
+whatever the length of the history. Updated buckets push a new heap entry
+and the old one is skipped when it surfaces. On start the snapshot is loaded
+and only the log records written after it are replayed; a snapshot is
+written every SNAPSHOT_EVERY attempts and whenever a new skill appears.
+"""
+import heapq
+import json
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from src.core.logger import Logger
+from src.utils.metrics import timed
+
+logger = Logger().get_logger()
+
+LOG_NAME = "attempts.bin"
+SNAPSHOT_NAME = "scheduler.json"
+
+# One attempt: when, which skill (index into the snapshot's skill list) and level, result, seconds taken
+RECORD = np.dtype([("time", "<f8"), ("skill", "<u2"), ("level", "u1"), ("correct", "u1"), ("latency", "<f4")])
+
+FIRST_INTERVAL = 60.0 # Seconds before a bucket answered correctly for the first time comes back
+RETRY_INTERVAL = 30.0 # Seconds before a bucket answered wrongly comes back
+MAX_INTERVAL = 180 * 86400.0
+START_EASE = 2.5
+MIN_EASE = 1.3
+MAX_EASE = 3.5
+SLOW_ANSWER = 120.0 # Correct answers slower than this lower the ease instead of raising it
+MASTERY_STREAK = 3
+SNAPSHOT_EVERY = 1000
+
+
+class Bucket:
+    """Review state of one (skill, level)."""
+
+    FIELDS = ("skill", "level", "due", "interval", "ease", "streak", "attempts", "correct", "latency_total")
+
+    def __init__(self, skill, level, due, interval=0.0, ease=START_EASE, streak=0, attempts=0, correct=0,
+                 latency_total=0.0):
+        self.skill = skill
+        self.level = level
+        self.due = due
+        self.interval = interval
+        self.ease = ease
+        self.streak = streak
+        self.attempts = attempts
+        self.correct = correct
+        self.latency_total = latency_total
+        self.seq = -1 # Sequence number of this bucket's live heap entry
+
+    def to_list(self):
+        return [getattr(self, name) for name in self.FIELDS]
+
+
+class ReviewScheduler:
+    def __init__(self, data_dir, skills=None):
+        """
+        data_dir: Directory holding the attempt log and snapshot (created if missing)
+        skills: {category: number of difficulty levels}; new categories get a level 1 bucket
+        """
+        self.data_dir = data_dir
+        self.log_path = os.path.join(data_dir, LOG_NAME)
+        self.snapshot_path = os.path.join(data_dir, SNAPSHOT_NAME)
+        self._lock = threading.Lock()
+        self.skills = [] # Skill names; position is the id stored in the log
+        self.skill_ids = {} # Skill name -> id
+        self.levels = [] # Difficulty levels per skill id
+        self.buckets = {} # (skill id, level) -> Bucket
+        self.heap = [] # [due, seq, (skill id, level)], stale entries included
+        self.seq = 0
+        self.log_offset = 0 # Bytes of the log covered by the snapshot
+        self.total_attempts = 0
+        self._since_snapshot = 0
+
+        os.makedirs(data_dir, exist_ok=True)
+        self._load()
+        self._log = open(self.log_path, "ab")
+        if skills:
+            self.add_skills(skills)
+
+    # --- Persistence ---
+
+    def _load(self):
+        start = time.perf_counter()
+        loaded = False
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            skills, levels = snapshot["skills"], snapshot["levels"]
+            buckets = [Bucket(*values) for values in snapshot["buckets"]]
+            self.log_offset = snapshot["log_offset"]
+            self.total_attempts = snapshot["attempts"]
+            self.skills, self.levels = skills, levels
+            self.skill_ids = {name: i for i, name in enumerate(skills)}
+            self.buckets = {(b.skill, b.level): b for b in buckets}
+            loaded = True
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, TypeError) as e:
+            logger.error(f"Unreadable scheduler snapshot, starting a new history: {e}")
+
+        size = os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0
+        torn = size % RECORD.itemsize
+        if torn:
+            # A crash mid-write leaves a partial record at the end; drop it
+            os.truncate(self.log_path, size - torn)
+            size -= torn
+        if not loaded:
+            if size:
+                # Log records name skills by id, which only the snapshot can resolve
+                logger.error("Scheduler snapshot missing; earlier attempts in the log are not replayed.")
+            self.log_offset = size
+        elif size < self.log_offset:
+            logger.error("Attempt log is shorter than its snapshot; replaying nothing.")
+            self.log_offset = size
+
+        tail = []
+        if size > self.log_offset:
+            tail = np.fromfile(self.log_path, dtype=RECORD, offset=self.log_offset).tolist()
+        for when, skill, level, correct, latency in tail:
+            self._apply(skill, level, bool(correct), latency, when)
+        self._since_snapshot = len(tail)
+        self.log_offset = size
+
+        for bucket in self.buckets.values():
+            self.seq += 1
+            bucket.seq = self.seq
+            self.heap.append([bucket.due, bucket.seq, (bucket.skill, bucket.level)])
+        heapq.heapify(self.heap)
+        logger.debug(f"Scheduler loaded: {self.total_attempts} attempts, {len(self.buckets)} buckets, "
+                    f"{len(tail)} replayed in {(time.perf_counter() - start) * 1000:.1f} ms.")
+
+    def snapshot(self):
+        """Writes every bucket and the current log length, so a restart replays nothing."""
+        with self._lock:
+            self._snapshot()
+
+    def _snapshot(self):
+        self._log.flush()
+        payload = {
+            "skills": self.skills,
+            "levels": self.levels,
+            "log_offset": self.log_offset,
+            "attempts": self.total_attempts,
+            "buckets": [bucket.to_list() for bucket in self.buckets.values()],
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.data_dir, suffix=".json.tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, self.snapshot_path)
+        self._since_snapshot = 0
+
+    def close(self):
+        with self._lock:
+            self._snapshot()
+            self._log.close()
+
+    # --- Skills ---
+
+    def add_skills(self, skills):
+        """Registers {category: levels}; unseen categories start with a level 1 bucket due now."""
+        with self._lock:
+            added = False
+            for name, levels in skills.items():
+                if name in self.skill_ids:
+                    self.levels[self.skill_ids[name]] = levels
+                    continue
+                self.skill_ids[name] = len(self.skills)
+                self.skills.append(name)
+                self.levels.append(levels)
+                self._add_bucket(len(self.skills) - 1, 1, time.time())
+                added = True
+            if added:
+                # Log records refer to skills by id, so the id table must be on disk first
+                self._snapshot()
+
+    def _add_bucket(self, skill, level, due):
+        bucket = self.buckets[(skill, level)] = Bucket(skill, level, due)
+        self._push(bucket)
+
+    def _push(self, bucket):
+        self.seq += 1
+        bucket.seq = self.seq
+        heapq.heappush(self.heap, [bucket.due, bucket.seq, (bucket.skill, bucket.level)])
+        if len(self.heap) > 2 * len(self.buckets) + 64:
+            # Mostly stale entries: rebuild from the live ones
+            self.heap = [[b.due, b.seq, key] for key, b in self.buckets.items()]
+            heapq.heapify(self.heap)
+
+    # --- Scheduling ---
+
+    def _apply(self, skill, level, correct, latency, now):
+        """Updates a skill and its bucket with one attempt. Shared by record() and log replay."""
+        self.levels[skill] = max(self.levels[skill], level)
+        bucket = self.buckets.get((skill, level))
+        if bucket is None:
+            # Attempts at a level the scheduler has not unlocked (chosen by hand) open it
+            bucket = self.buckets[(skill, level)] = Bucket(skill, level, now)
+        bucket.attempts += 1
+        bucket.latency_total += latency
+        self.total_attempts += 1
+        if correct:
+            bucket.correct += 1
+            bucket.streak += 1
+            bucket.interval = min(MAX_INTERVAL, bucket.interval * bucket.ease) if bucket.interval else FIRST_INTERVAL
+            bucket.ease += 0.1 if latency <= SLOW_ANSWER else -0.05
+        else:
+            bucket.streak = 0
+            bucket.interval = 0.0
+            bucket.ease -= 0.2
+        bucket.ease = min(MAX_EASE, max(MIN_EASE, bucket.ease))
+        bucket.due = now + (bucket.interval or RETRY_INTERVAL)
+
+        unlocked = None
+        if bucket.streak >= MASTERY_STREAK and level < self.levels[skill] and (skill, level + 1) not in self.buckets:
+            unlocked = self.buckets[(skill, level + 1)] = Bucket(skill, level + 1, now)
+        return bucket, unlocked
+
+    @timed("scheduler.record")
+    def record(self, category, level, correct, latency, now=None):
+        """
+        Logs one attempt and reschedules its bucket.
+        level: Difficulty level the problem was generated at (1 for single-level categories)
+        latency: Seconds from showing the problem to the answer
+        """
+        now = time.time() if now is None else now
+        if category not in self.skill_ids:
+            self.add_skills({category: level})
+        with self._lock:
+            skill = self.skill_ids[category]
+            record = np.array([(now, skill, level, correct, latency)], dtype=RECORD)
+            self._log.write(record.tobytes())
+            self.log_offset += RECORD.itemsize
+            for bucket in self._apply(skill, level, bool(correct), float(latency), now):
+                if bucket is not None:
+                    self._push(bucket)
+            self._since_snapshot += 1
+            if self._since_snapshot >= SNAPSHOT_EVERY:
+                self._snapshot()
+            else:
+                self._log.flush()
+
+    @timed("scheduler.next")
+    def next(self):
+        """(category, level) of the bucket due soonest (possibly not due yet), or None if there are no skills."""
+        with self._lock:
+            while self.heap:
+                due, seq, key = self.heap[0]
+                if self.buckets[key].seq == seq:
+                    return self.skills[key[0]], key[1]
+                heapq.heappop(self.heap)
+            return None
+
+    def due_count(self, now=None):
+        """Buckets due by now (scans the buckets, for display)."""
+        now = time.time() if now is None else now
+        return sum(1 for bucket in self.buckets.values() if bucket.due <= now)
+
+    # --- History ---
+
+    def attempts(self):
+        """The whole attempt log as a read-only memory-mapped RECORD array."""
+        with self._lock:
+            self._log.flush()
+        if not self.log_offset:
+            return np.empty(0, dtype=RECORD)
+        return np.memmap(self.log_path, dtype=RECORD, mode="r", shape=(self.log_offset // RECORD.itemsize,))
+
+    def summary(self, now=None):
+        """One dict per bucket: accuracy, mean latency, interval and time until due."""
+        now = time.time() if now is None else now
+        with self._lock:
+            rows = []
+            for (skill, level), bucket in sorted(self.buckets.items()):
+                rows.append({
+                    "Skill": self.skills[skill],
+                    "Level": level,
+                    "Attempts": bucket.attempts,
+                    "Accuracy": bucket.correct / bucket.attempts if bucket.attempts else None,
+                    "Mean time (s)": bucket.latency_total / bucket.attempts if bucket.attempts else None,
+                    "Interval (min)": bucket.interval / 60,
+                    "Due in (min)": max(0.0, bucket.due - now) / 60,
+                })
+            return rows
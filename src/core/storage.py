@@ -0,0 +1,231 @@
+import math
+import os
+import sqlite3
+import tempfile
+import threading
+from contextlib import contextmanager
+
+import pandas as pd
+
+from src.core.logger import Logger
+
+logger = Logger().get_logger()
+
+COLUMNS = ["Week", "Track", "Module", "Topic", "Planned Hours", "Status", "Output Lab"]
+
+# DataFrame column -> SQLite column
+SQL_COLUMNS = {
+    "Week": "week",
+    "Track": "track",
+    "Module": "module",
+    "Topic": "topic",
+    "Planned Hours": "planned_hours",
+    "Status": "status",
+    "Output Lab": "output_lab",
+}
+
+
+def empty_schedule():
+    return pd.DataFrame(columns=COLUMNS).rename_axis("id")
+
+
+def _normalize(df):
+    """Schedule with the expected columns and a string "Output Lab" (Streamlit needs it)."""
+    df = df.reindex(columns=COLUMNS)
+    df["Output Lab"] = df["Output Lab"].fillna("").astype(str)
+    return df
+
+
+def diff_schedules(old, new):
+    """
+    Row-level differences between two schedules indexed by row id.
+    Returns (inserted, changed, deleted) index objects.
+    """
+    deleted = old.index.difference(new.index)
+    inserted = new.index.difference(old.index)
+    common = new.index.intersection(old.index)
+    a, b = new.loc[common, COLUMNS], old.loc[common, COLUMNS]
+    differs = (a.ne(b) & ~(a.isna() & b.isna())).any(axis=1)
+    return inserted, common[differs.to_numpy()], deleted
+
+
+def rebase_schedule(base, edited, current):
+    """
+    Applies the row changes between base and edited (both indexed by row id) to
+    current, a newer version of base: rows added in edited (unknown or missing
+    id) are appended, rows deleted from it are dropped and rows changed in it
+    replace current's. Rows current no longer has stay deleted.
+    """
+    inserted = ~edited.index.isin(base.index)
+    deleted = base.index.difference(edited.index)
+    _, changed, _ = diff_schedules(base, edited[~inserted])
+    keep = current.index.difference(deleted, sort=False)
+    updated = changed.intersection(keep)
+    rows = pd.concat([current.loc[keep.difference(updated)], edited.loc[updated]]).sort_index()
+    return pd.concat([rows, edited[inserted]])
+
+
+def _assign_ids(df, last_id=0):
+    """
+    Gives rows without a usable id (e.g. added in the editor) a fresh one, above
+    both the ids in df and last_id. Modifies and returns df.
+    """
+    ids = pd.to_numeric(pd.Series(df.index, index=df.index), errors="coerce")
+    fresh = ids.isna() | ids.duplicated()
+    if fresh.any():
+        next_id = int(max(ids.max(skipna=True) if ids.notna().any() else 0, last_id)) + 1
+        ids[fresh] = range(next_id, next_id + int(fresh.sum()))
+    df.index = ids.astype("int64").rename("id")
+    return df
+
+
+class CSVStorage:
+    """Whole-file CSV storage. Saves go through a temp file so a crash cannot truncate the CSV."""
+
+    def __init__(self, csv_path):
+        self.csv_path = csv_path
+
+    def load(self):
+        if not os.path.exists(self.csv_path):
+            logger.warning("Dashboard CSV not found, creating new one.")
+            return empty_schedule()
+        return _normalize(pd.read_csv(self.csv_path)).rename_axis("id")
+
+    def save(self, df):
+        """Writes df (without row ids). Returns it with unique row ids as its index."""
+        df = _assign_ids(df.copy(deep=False))
+        directory = os.path.dirname(self.csv_path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".csv.tmp")
+        try:
+            with os.fdopen(fd, "w", newline="") as f:
+                df.to_csv(f, index=False)
+            os.replace(tmp_path, self.csv_path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+        return df
+
+    def export_csv(self, path):
+        self.load().to_csv(path, index=False)
+
+
+class SQLiteStorage:
+    """
+    SQLite storage (WAL mode) with an integer primary key per schedule row.
+
+    The DataFrame index carries the row id. save() diffs the given table
+    against the last known database state and writes only inserted, changed
+    and deleted rows, all in one transaction. If the database is empty and a
+    CSV path is given, the CSV is imported once.
+    """
+
+    def __init__(self, db_path, csv_path=None):
+        self.db_path = db_path
+        self.csv_path = csv_path
+        self._lock = threading.Lock()
+        self._snapshot = None # Last loaded/saved table, indexed by id
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._transaction() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            columns = ", ".join(f"{col} {kind}" for col, kind in zip(
+                SQL_COLUMNS.values(), ("INTEGER", "TEXT", "TEXT", "TEXT", "NUMERIC", "TEXT", "TEXT")
+            ))
+            conn.execute(f"CREATE TABLE IF NOT EXISTS schedule (id INTEGER PRIMARY KEY, {columns})")
+        self._import_csv_once()
+
+    @contextmanager
+    def _transaction(self):
+        """Connection whose statements commit together (or roll back on error), closed afterwards."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _import_csv_once(self):
+        if not self.csv_path or not os.path.exists(self.csv_path):
+            return
+        with self._transaction() as conn:
+            if conn.execute("SELECT COUNT(*) FROM schedule").fetchone()[0]:
+                return
+            df = _normalize(pd.read_csv(self.csv_path))
+            placeholders = ", ".join("?" * len(COLUMNS))
+            conn.executemany(
+                f"INSERT INTO schedule ({', '.join(SQL_COLUMNS.values())}) VALUES ({placeholders})",
+                _rows(df, with_id=False)
+            )
+        logger.info(f"Imported {len(df)} rows from {self.csv_path} into {self.db_path}")
+
+    def _read(self):
+        with self._transaction() as conn:
+            df = pd.read_sql_query("SELECT * FROM schedule ORDER BY id", conn, index_col="id")
+        df = df.rename(columns={sql: col for col, sql in SQL_COLUMNS.items()})
+        return _normalize(df)
+
+    def load(self):
+        with self._lock:
+            self._snapshot = self._read()
+            # Copy-on-write (pandas 3): the copy shares the snapshot's data until either is modified
+            return self._snapshot.copy(deep=False)
+
+    def save(self, df):
+        """Writes the differences between df and the stored table. Returns df with row ids as its index."""
+        df = _normalize(df)
+        with self._lock:
+            old = self._snapshot if self._snapshot is not None else self._read()
+
+            df = _assign_ids(df, old.index.max() if len(old) else 0)
+
+            inserted, changed, deleted = diff_schedules(old, df)
+            upserts = df.loc[changed.append(inserted)]
+
+            if len(upserts) or len(deleted):
+                assignments = ", ".join(f"{sql}=excluded.{sql}" for sql in SQL_COLUMNS.values())
+                placeholders = ", ".join("?" * (len(COLUMNS) + 1))
+                with self._transaction() as conn:
+                    conn.executemany(
+                        f"INSERT INTO schedule (id, {', '.join(SQL_COLUMNS.values())}) VALUES ({placeholders}) "
+                        f"ON CONFLICT(id) DO UPDATE SET {assignments}",
+                        _rows(upserts, with_id=True)
+                    )
+                    conn.executemany("DELETE FROM schedule WHERE id = ?", [(int(i),) for i in deleted])
+            logger.info(f"Saved schedule: {len(upserts)} rows upserted, {len(deleted)} deleted.")
+
+            self._snapshot = df.copy(deep=False)
+            return df
+
+    def export_csv(self, path):
+        self._read().to_csv(path, index=False)
+
+
+def _rows(df, with_id):
+    """Plain-Python row tuples (sqlite3 does not accept NumPy scalars or NaN)."""
+    columns = [df.index.tolist()] if with_id else []
+    for col in COLUMNS:
+        values = df[col].tolist()
+        columns.append([None if isinstance(v, float) and math.isnan(v) else v for v in values])
+    return list(zip(*columns))
+
+
+def get_storage(backend, data_dir):
+    """Storage for the dashboard schedule: "sqlite" (default) or "csv"."""
+    csv_path = os.path.join(data_dir, "dashboard.csv")
+    if backend == "csv":
+        return CSVStorage(csv_path)
+    if backend == "sqlite":
+        return SQLiteStorage(os.path.join(data_dir, "dashboard.db"), csv_path=csv_path)
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export the dashboard schedule from SQLite to CSV.")
+    parser.add_argument("output", help="CSV file to write")
+    parser.add_argument("--data-dir", default=os.path.join(os.path.dirname(__file__), "../../data"))
+    args = parser.parse_args()
+    get_storage("sqlite", args.data_dir).export_csv(args.output)
+    print(f"Exported schedule to {args.output}")
@@ -0,0 +1,317 @@
+"""
+Columnar store of schedule snapshots for many learners, with cohort queries.
+
+Every append writes one learner's whole schedule as an uncompressed Arrow IPC
+file, hive-partitioned by learner and by the ISO week of the snapshot:
+
+    root/learner=<id>/snapshot_week=<YYYY-Www>/<ms>.arrow          one snapshot
+    root/learner=<id>/snapshot_week=<YYYY-Www>/<ms>-<ms>.arrow     compacted snapshots of a past week
+
+Queries prune by partition before opening anything: a learner filter picks
+learner directories, a time filter picks snapshot weeks, and the cohort's
+current state is each learner's newest file, found from directory listings.
+Selected files are memory-mapped (Arrow IPC needs no decoding, so only the
+pages of the projected columns are read) and aggregated FILES_PER_BLOCK
+files at a time into partial group totals. A cohort of thousands of
+learners is therefore summarized without being loaded into memory. The
+layout is plain hive partitioning, so dataset() or any Arrow-aware tool can
+also query it directly; the generic dataset scanner is not used for the
+built-in queries because its per-file overhead is several times higher.
+
+compact() merges each past week's snapshots of a learner into one file, so
+the number of files (which dominates scan time) grows with learners x weeks
+rather than with the number of saves.
+"""
+import os
+import re
+import tempfile
+import threading
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+from pyarrow import feather, ipc
+from pyarrow import fs as pafs
+
+from src.core.logger import Logger
+from src.core.progress import IN_PROGRESS_WEIGHT
+from src.core.storage import COLUMNS, SQL_COLUMNS
+from src.utils.metrics import timed
+
+logger = Logger().get_logger()
+
+# Schedule columns as stored (snake_case, as in SQLiteStorage), plus the snapshot time
+SCHEMA = pa.schema([
+    ("snapshot", pa.timestamp("ms", tz="UTC")),
+    ("week", pa.int16()),
+    ("track", pa.string()),
+    ("module", pa.string()),
+    ("topic", pa.string()),
+    ("planned_hours", pa.float32()),
+    ("status", pa.string()),
+    ("output_lab", pa.string()),
+])
+PARTITIONING = ds.partitioning(pa.schema([("learner", pa.string()), ("snapshot_week", pa.string())]), flavor="hive")
+LEARNER_ID = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]*$")
+FILES_PER_BLOCK = 256 # Snapshot files aggregated per step of a query
+
+_MMAP_FS = pafs.LocalFileSystem(use_mmap=True)
+
+
+def _utc(when):
+    """Naive datetimes are taken as UTC."""
+    return when.replace(tzinfo=timezone.utc) if when.tzinfo is None else when.astimezone(timezone.utc)
+
+
+def snapshot_week(when):
+    """ISO week partition value of a datetime, e.g. "2026-W07" (sorts chronologically)."""
+    year, week, _ = when.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _last_ms(filename):
+    """Time of the newest snapshot in a file named <ms>.arrow or <first ms>-<last ms>.arrow."""
+    return int(filename.split(".")[0].split("-")[-1])
+
+
+def _read(path, columns):
+    """
+    Projected columns of one snapshot file. The file is memory-mapped and
+    Arrow IPC is read without copying, so pages of other columns are never touched.
+    """
+    return ipc.open_file(pa.memory_map(path)).read_all().select(columns)
+
+
+def _hours(table):
+    """
+    (planned, remaining) hours per row. In Progress rows count as
+    IN_PROGRESS_WEIGHT done, as in ProgressAggregates.
+    """
+    hours = pc.fill_null(table["planned_hours"].cast(pa.float64()), 0.0)
+    status = table["status"]
+    remaining = pc.if_else(pc.equal(status, "Done"), 0.0,
+                           pc.if_else(pc.equal(status, "In Progress"), pc.multiply(hours, 1 - IN_PROGRESS_WEIGHT), hours))
+    return hours, remaining
+
+
+class ProgressWarehouse:
+    def __init__(self, root):
+        """root: Directory of the partitioned store (created on first append)"""
+        self.root = root
+        self._lock = threading.Lock()
+
+    # --- Writing ---
+
+    def _learner_dir(self, learner):
+        if not LEARNER_ID.match(learner):
+            raise ValueError(f"Invalid learner id: {learner!r}")
+        return os.path.join(self.root, f"learner={learner}")
+
+    @staticmethod
+    def to_table(df, when):
+        """Arrow table of a schedule DataFrame (dashboard columns), stamped with the snapshot time."""
+        arrays = [pa.repeat(pa.scalar(when, SCHEMA.field("snapshot").type), len(df))]
+        for column in COLUMNS:
+            field = SCHEMA.field(SQL_COLUMNS[column])
+            values = df[column] if column in df else pd.Series(None, index=df.index, dtype=object)
+            if pa.types.is_integer(field.type) or pa.types.is_floating(field.type):
+                values = pd.to_numeric(values, errors="coerce")
+            arrays.append(pa.array(values, type=field.type, from_pandas=True))
+        return pa.Table.from_arrays(arrays, schema=SCHEMA)
+
+    @timed("warehouse.append")
+    def append(self, learner, df, when=None):
+        """Writes a snapshot of a learner's schedule. Returns the file path."""
+        when = _utc(when) if when else datetime.now(timezone.utc)
+        directory = os.path.join(self._learner_dir(learner), f"snapshot_week={snapshot_week(when)}")
+        ms = int(when.timestamp() * 1000)
+        path = os.path.join(directory, f"{ms}.arrow")
+        with self._lock:
+            while os.path.exists(path):
+                # Two snapshots within one millisecond: keep both, as distinct snapshot times
+                ms += 1
+                path = os.path.join(directory, f"{ms}.arrow")
+            self._write(self.to_table(df, datetime.fromtimestamp(ms / 1000, timezone.utc)), path)
+        return path
+
+    def _write(self, table, path):
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        # Dot prefix: dataset discovery ignores the file until it is complete
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+        os.close(fd)
+        try:
+            feather.write_feather(table, tmp_path, compression="uncompressed")
+            os.replace(tmp_path, path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+    # --- Files ---
+
+    def learners(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(entry.name.split("=", 1)[1] for entry in os.scandir(self.root)
+                      if entry.is_dir() and entry.name.startswith("learner="))
+
+    def _weeks(self, learner):
+        directory = self._learner_dir(learner)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(entry.name for entry in os.scandir(directory)
+                      if entry.is_dir() and entry.name.startswith("snapshot_week="))
+
+    def _files(self, directory):
+        return [entry.name for entry in os.scandir(directory) if entry.name.endswith(".arrow")]
+
+    def latest_files(self, learners=None):
+        """Newest snapshot file of each learner; only their most recent week directory is listed."""
+        files = []
+        for learner in learners if learners is not None else self.learners():
+            for week in reversed(self._weeks(learner)):
+                directory = os.path.join(self._learner_dir(learner), week)
+                names = self._files(directory)
+                if names:
+                    files.append(os.path.join(directory, max(names, key=_last_ms)))
+                    break
+        return files
+
+    def dataset(self, files=None):
+        """Memory-mapped pyarrow dataset over the given files, or the whole store, for ad-hoc queries."""
+        source = files if files is not None else self.root
+        return ds.dataset(source, schema=SCHEMA.append(pa.field("learner", pa.string()))
+                          .append(pa.field("snapshot_week", pa.string())),
+                          format="ipc", filesystem=_MMAP_FS, partitioning=PARTITIONING,
+                          partition_base_dir=self.root)
+
+    # --- Queries ---
+
+    def _blocks(self, files, columns):
+        """
+        Projected columns of files, FILES_PER_BLOCK files per table, with a
+        "file" column holding each row's index into files. Memory use is
+        bounded by one block whatever the number of files.
+        """
+        for start in range(0, len(files), FILES_PER_BLOCK):
+            tables = [_read(path, columns) for path in files[start:start + FILES_PER_BLOCK]]
+            block = pa.concat_tables(tables)
+            index = np.repeat(np.arange(start, start + len(tables), dtype=np.int32), [t.num_rows for t in tables])
+            yield block.append_column("file", pa.array(index))
+
+    @timed("warehouse.completion")
+    def completion(self, learners=None):
+        """
+        Completion by plan week and track over each learner's latest snapshot.
+        Returns a DataFrame: week, track, learners, planned_hours, done_hours, completion.
+        """
+        partials = []
+        for block in self._blocks(self.latest_files(learners), ["week", "track", "planned_hours", "status"]):
+            hours, remaining = _hours(block)
+            block = pa.table({"week": block["week"], "track": block["track"], "file": block["file"],
+                              "planned_hours": hours, "remaining_hours": remaining})
+            # One file per learner, so distinct files within a block are distinct learners
+            partials.append(block.group_by(["week", "track"]).aggregate([
+                ("file", "count_distinct"), ("planned_hours", "sum"), ("remaining_hours", "sum")
+            ]).to_pandas())
+        if not partials:
+            return pd.DataFrame(columns=["week", "track", "learners", "planned_hours", "done_hours", "completion"])
+
+        groups = pd.concat(partials).groupby(["week", "track"], as_index=False).sum()
+        groups = groups.rename(columns={"file_count_distinct": "learners", "planned_hours_sum": "planned_hours"})
+        groups["done_hours"] = groups["planned_hours"] - groups.pop("remaining_hours_sum")
+        planned = groups["planned_hours"].where(groups["planned_hours"] > 0)
+        groups["completion"] = (groups["done_hours"] / planned).fillna(0.0)
+        return groups[["week", "track", "learners", "planned_hours", "done_hours", "completion"]]
+
+    def _history_files(self, since=None, learners=None):
+        """(file, learner) of every snapshot file in weeks from since on; other weeks are not listed."""
+        first_week = f"snapshot_week={snapshot_week(since)}" if since is not None else ""
+        files = []
+        for learner in learners if learners is not None else self.learners():
+            for week in self._weeks(learner):
+                if week >= first_week:
+                    directory = os.path.join(self._learner_dir(learner), week)
+                    files += [(os.path.join(directory, name), learner) for name in self._files(directory)]
+        return files
+
+    @timed("warehouse.burndown")
+    def burndown(self, since=None, learners=None, freq="D"):
+        """
+        Cohort hours remaining over time: per period, the sum over learners of
+        the remaining hours in their latest snapshot so far.
+        since: datetime; snapshot weeks before it are not read
+        Returns a DataFrame indexed by period end: remaining_hours, planned_hours, learners.
+        """
+        since = _utc(since) if since is not None else None
+        history = self._history_files(since, learners)
+        files = [path for path, _ in history]
+        partials = []
+        for block in self._blocks(files, ["snapshot", "planned_hours", "status"]):
+            if since is not None:
+                # Compacted files of the first week may hold older snapshots
+                block = block.filter(pc.greater_equal(block["snapshot"], pa.scalar(since, block["snapshot"].type)))
+            hours, remaining = _hours(block)
+            block = pa.table({"file": block["file"], "snapshot": block["snapshot"],
+                              "planned_hours": hours, "remaining_hours": remaining})
+            partials.append(block.group_by(["file", "snapshot"]).aggregate([
+                ("planned_hours", "sum"), ("remaining_hours", "sum")
+            ]).to_pandas())
+        if not partials:
+            return pd.DataFrame(columns=["remaining_hours", "planned_hours", "learners"])
+
+        per_snapshot = pd.concat(partials, ignore_index=True).rename(
+            columns={"planned_hours_sum": "planned_hours", "remaining_hours_sum": "remaining_hours"})
+        per_snapshot["learner"] = [history[i][1] for i in per_snapshot["file"]]
+        # One value per learner and period (their last snapshot in it), carried forward through later periods
+        per_snapshot = per_snapshot.sort_values("snapshot")
+        per_snapshot["period"] = per_snapshot["snapshot"].dt.tz_convert(None).dt.to_period(freq)
+        last = per_snapshot.groupby(["period", "learner"])[["remaining_hours", "planned_hours"]].last()
+        periods = pd.period_range(per_snapshot["period"].iloc[0], per_snapshot["period"].iloc[-1], freq=freq)
+        carried = {col: last[col].unstack("learner").reindex(periods).ffill().set_axis(periods.end_time)
+                   for col in ("remaining_hours", "planned_hours")}
+        return pd.DataFrame({
+            "remaining_hours": carried["remaining_hours"].sum(axis=1),
+            "planned_hours": carried["planned_hours"].sum(axis=1),
+            "learners": carried["planned_hours"].notna().sum(axis=1),
+        })
+
+    # --- Maintenance ---
+
+    @timed("warehouse.compact")
+    def compact(self, before=None):
+        """
+        Merges the snapshots of each learner's weeks before `before` (default:
+        the current week) into one file per week. The newest snapshot of a
+        learner is never merged, so latest_files() stays a directory listing.
+        Returns the number of files removed.
+        """
+        current = snapshot_week(before or datetime.now(timezone.utc))
+        removed = 0
+        latest = set(self.latest_files())
+        with self._lock:
+            for learner in self.learners():
+                for week in self._weeks(learner):
+                    if week.split("=", 1)[1] >= current:
+                        continue
+                    directory = os.path.join(self._learner_dir(learner), week)
+                    paths = [os.path.join(directory, name) for name in sorted(self._files(directory), key=_last_ms)]
+                    paths = [path for path in paths if path not in latest]
+                    if len(paths) < 2:
+                        continue
+                    tables = [feather.read_table(path, memory_map=True) for path in paths]
+                    merged = pa.concat_tables(tables).sort_by("snapshot")
+                    first = int(pc.min(merged["snapshot"]).value)
+                    last = int(pc.max(merged["snapshot"]).value)
+                    output = os.path.join(directory, f"{first}-{last}.arrow")
+                    self._write(merged, output)
+                    del tables, merged # Release the memory maps before deleting the files
+                    for path in paths:
+                        if path != output: # An input with the merged range's name was just replaced
+                            os.remove(path)
+                    removed += len(paths) - 1
+        logger.info(f"Warehouse compacted: {removed} files removed.")
+        return removed
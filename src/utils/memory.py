@@ -0,0 +1,65 @@
+"""
+Approximate deep sizes of Python objects, for the dashboard's session memory report.
+"""
+import gc
+import sys
+import types
+
+import numpy as np
+
+# Shared by the whole process, never counted as part of an object
+SKIPPED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+
+_globals = (0, frozenset()) # (number of modules, ids) of the last module_globals() scan
+
+
+def module_globals():
+    """
+    Ids of every object bound to a global of an imported module (except
+    __main__, the running script). These are process-wide, e.g. sympy's
+    assumption rules, which every expression reaches, so deep_sizeof does not
+    count them. Rescanned only when modules have been imported since.
+    """
+    global _globals
+    modules = list(sys.modules.items())
+    if len(modules) != _globals[0]:
+        ids = set()
+        for name, module in modules:
+            namespace = getattr(module, "__dict__", None)
+            if namespace is not None and name != "__main__":
+                ids.update(map(id, list(namespace.values())))
+        _globals = (len(modules), frozenset(ids))
+    return _globals[1]
+
+
+def deep_sizeof(obj, seen=None):
+    """
+    Bytes reachable from obj: sys.getsizeof of every object found through
+    gc.get_referents, with NumPy arrays counted by their data and pandas
+    objects by memory_usage(deep=True). Module globals are not counted.
+    seen: Set of ids already counted; pass the same set to size several objects
+          without counting what they share twice (it is updated in place)
+    """
+    if seen is None:
+        seen = set()
+    if not seen:
+        seen.update(module_globals())
+    total = 0
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, SKIPPED_TYPES):
+            continue
+        seen.add(id(obj))
+        if isinstance(obj, np.ndarray):
+            total += sys.getsizeof(obj) if obj.base is None else obj.nbytes
+            if obj.dtype == object:
+                stack.extend(obj.ravel().tolist())
+        elif type(obj).__module__.startswith("pandas") and hasattr(obj, "memory_usage"):
+            usage = obj.memory_usage(deep=True)
+            total += int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+        else:
+            total += sys.getsizeof(obj)
+            stack.extend(gc.get_referents(obj))
+    return total
@@ -0,0 +1,188 @@
+"""
+Lightweight in-process instrumentation: timers, value samples and counters.
+
+Each metric keeps its most recent samples in a fixed-size ring buffer, so
+memory stays bounded however long the process runs, and summary() reports
+p50/p95/p99 over that window. Recording is a perf_counter() pair and a
+deque append; with metrics disabled (MATHAPP_METRICS=0 or set_enabled(False))
+timers reduce to a flag check.
+
+    @timed("generator.get_problem")
+    def get_problem(...): ...
+
+    with timer("section.render_analytics"):
+        ...
+
+    observe("simulation.steps", result.steps)
+    increment("dashboard.save_failures")
+"""
+import functools
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+
+# Samples kept per metric (older ones are overwritten)
+RING_SIZE = 1024
+
+_enabled = os.environ.get("MATHAPP_METRICS", "1").lower() not in ("0", "false", "no", "off")
+_lock = threading.Lock()
+_samples = {} # name -> deque of values (seconds for timers)
+_units = {} # name -> "s" for timers, "" for plain values
+_counters = {}
+
+
+def is_enabled():
+    return _enabled
+
+
+def set_enabled(enabled):
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def _ring(name, unit):
+    ring = _samples.get(name)
+    if ring is None:
+        with _lock:
+            ring = _samples.setdefault(name, deque(maxlen=RING_SIZE))
+            _units.setdefault(name, unit)
+    return ring
+
+
+def observe(name, value):
+    """Records one sample of a value (e.g. a step count)."""
+    if _enabled:
+        _ring(name, "").append(value)
+
+
+def increment(name, amount=1):
+    if _enabled:
+        with _lock:
+            _counters[name] = _counters.get(name, 0) + amount
+
+
+class _Timer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        _ring(self.name, "s").append(time.perf_counter() - self.start)
+        return False
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(name):
+    """Context manager recording the wall time of its block under name."""
+    return _Timer(name) if _enabled else _NULL_TIMER
+
+
+def timed(name):
+    """Decorator recording the wall time of every call under name."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _ring(name, "s").append(time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def _percentile(ordered, q):
+    """Nearest-rank percentile of an already sorted list."""
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def summary():
+    """
+    Per-metric statistics over the samples currently in each ring buffer.
+    Timers are reported in milliseconds. Returns {name: {"unit", "count", "mean", "p50", "p95", "p99", "max"}}.
+    """
+    with _lock:
+        snapshot = {name: (list(ring), _units[name]) for name, ring in _samples.items()}
+    result = {}
+    for name, (values, unit) in sorted(snapshot.items()):
+        if not values:
+            continue
+        scale = 1000.0 if unit == "s" else 1.0
+        ordered = sorted(values)
+        result[name] = {
+            "unit": "ms" if unit == "s" else "",
+            "count": len(ordered),
+            "mean": sum(ordered) / len(ordered) * scale,
+            "p50": _percentile(ordered, 50) * scale,
+            "p95": _percentile(ordered, 95) * scale,
+            "p99": _percentile(ordered, 99) * scale,
+            "max": ordered[-1] * scale,
+        }
+    return result
+
+
+def counters():
+    with _lock:
+        return dict(sorted(_counters.items()))
+
+
+def reset():
+    with _lock:
+        _samples.clear()
+        _units.clear()
+        _counters.clear()
+
+
+def dump_json(path):
+    """Writes the current summary and counters to path (atomically)."""
+    report = {"time": time.time(), "enabled": _enabled, "metrics": summary(), "counters": counters()}
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".json.tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    os.replace(tmp_path, path)
+    return report
+
+
+class PeriodicDump:
+    """Daemon thread calling dump_json(path) every interval seconds until stop()."""
+
+    def __init__(self, path, interval=60.0):
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-dump", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                dump_json(self.path)
+            except OSError:
+                pass # Metrics must never take the app down; try again next interval
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
@@ -0,0 +1,87 @@
+"""
+Startup-time helpers: deferred imports and an import-time breakdown.
+
+Heavy dependencies are imported through timed_import() / LazyModule so that
+they load only when first needed, and each first import is recorded for the
+dashboard's startup report.
+
+Run `python -m src.utils.startup` for a cold (fresh interpreter) breakdown.
+"""
+import importlib
+import re
+import subprocess
+import sys
+import time
+
+# Process start reference for time-to-first-paint measurements
+PROCESS_START = time.perf_counter()
+
+# Module name -> seconds spent on its first import in this process
+IMPORT_TIMES = {}
+
+# Modules the dashboard loads on demand, used by the cold-start breakdown
+HEAVY_MODULES = (
+    "pandas", "numpy", "plotly.express", "plotly.graph_objects", "sympy",
+    "PIL.Image", "streamlit", "streamlit_drawable_canvas",
+)
+
+
+def timed_import(name):
+    """Imports a module, recording how long the first import took."""
+    if name in IMPORT_TIMES or name in sys.modules:
+        # import_module (not sys.modules) so a concurrent first import is waited for
+        return importlib.import_module(name)
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    IMPORT_TIMES.setdefault(name, time.perf_counter() - start)
+    return module
+
+
+class LazyModule:
+    """Stand-in for a module that is imported on first attribute access."""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = timed_import(self._name)
+        return getattr(self._module, attr)
+
+    @property
+    def loaded(self):
+        return self._module is not None
+
+
+def import_report():
+    """First-import times recorded so far, slowest first, as (module, milliseconds) pairs."""
+    return sorted(((name, seconds * 1000) for name, seconds in IMPORT_TIMES.items()),
+                  key=lambda item: item[1], reverse=True)
+
+
+def cold_import_times(modules=HEAVY_MODULES):
+    """
+    Cumulative import time (ms) of each module in a fresh interpreter,
+    measured with `python -X importtime`.
+    """
+    results = {}
+    for name in modules:
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {name}"],
+            capture_output=True, text=True
+        )
+        # Lines look like: "import time:   self [us] | cumulative | name"
+        cumulative = None
+        for line in proc.stderr.splitlines():
+            match = re.match(r"import time:\s+\d+\s+\|\s+(\d+)\s+\|\s*(\S+)", line)
+            if match and match.group(2) == name:
+                cumulative = int(match.group(1)) / 1000
+        results[name] = cumulative
+    return results
+
+
+if __name__ == "__main__":
+    print(f"{'module':<28}{'cold import (ms)':>18}")
+    for name, ms in cold_import_times().items():
+        print(f"{name:<28}{'n/a' if ms is None else f'{ms:.1f}':>18}")